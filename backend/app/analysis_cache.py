@@ -0,0 +1,97 @@
+"""
+Cache of comprehensive_resume_job_analysis results.
+
+Entries are keyed by the content hashes of the resume and job description texts
+plus the TF-IDF model version, so a key always identifies the same result; it is
+also used as the ETag of match responses.
+"""
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+try:
+    from backend.utils import metrics
+except ImportError:
+    import metrics
+from document_registry import document_id
+
+# Bump whenever the analysis output changes so results from older code are not reused
+ANALYSIS_VERSION = "1"
+
+# Results kept in memory (0 disables the cache) and how long, in seconds
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1024"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+
+
+def analysis_key(resume_text, job_description_text, model_version):
+    """
+    Return the cache key of analyzing resume_text against job_description_text.
+    """
+    parts = [f"analysis-v{ANALYSIS_VERSION}", model_version, document_id(resume_text), document_id(job_description_text)]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:32]
+
+
+class AnalysisCache:
+    """
+    LRU of analysis results bounded by entry count, with a time-to-live.
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key):
+        """
+        Return the cached result for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.increment("analysis_cache_misses_total")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        metrics.increment("analysis_cache_hits_total")
+        return entry[0]
+
+    def put(self, key, result):
+        """
+        Store a result under key, evicting the least recently used entries.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (result, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Return hit/miss counters and the number of cached results.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+
+# Shared cache instance used by the match endpoints
+analysis_cache = AnalysisCache(max_entries=ANALYSIS_CACHE_MAX_ENTRIES, ttl=ANALYSIS_CACHE_TTL)
@@ -0,0 +1,175 @@
+"""
+Registry of documents that are matched repeatedly: job descriptions and resumes.
+
+A document is registered once and its precomputed analysis (see
+tfidf_analyzer.prepare_document) is kept under a content-derived id: in memory
+in an LRU bounded by size, and in a local SQLite database so registered
+documents survive restarts.
+"""
+import os
+import time
+import pickle
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding registered documents
+REGISTRY_DB_PATH = os.getenv(
+    "REGISTRY_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "registry.sqlite3")
+)
+# Memory budget of the in-memory tier of the job description registry
+JOB_REGISTRY_MAX_BYTES = int(os.getenv("JOB_REGISTRY_MAX_BYTES", str(32 * 1024 * 1024)))
+# Memory budget of the in-memory tier of the resume registry
+RESUME_REGISTRY_MAX_BYTES = int(os.getenv("RESUME_REGISTRY_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+"""
+
+
+class UnknownDocumentError(LookupError):
+    """Raised when a document id is not registered."""
+
+
+def document_id(text):
+    """
+    Return the registry id of a document text; the same text always gets the same id.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+class DocumentRegistry:
+    """
+    Documents of one kind, kept in memory (LRU bounded by max_bytes) and in SQLite.
+
+    Records are dicts pickled as-is, so they can hold sparse vectors. The
+    database is opened lazily and per operation, so one registry can be shared
+    by threads.
+    """
+
+    def __init__(self, kind, path=None, max_bytes=32 * 1024 * 1024):
+        self.kind = kind
+        self.path = path or REGISTRY_DB_PATH
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def _connect(self):
+        if not self._schema_ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            if not self._schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+            yield conn
+        finally:
+            conn.close()
+
+    def put(self, doc_id, record):
+        """
+        Store (or replace) a record under doc_id.
+        """
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (kind, id, data, created_at) VALUES (?, ?, ?, ?)",
+                (self.kind, doc_id, data, time.time()),
+            )
+        self._remember(doc_id, record, len(data))
+
+    def get(self, doc_id):
+        """
+        Return the record stored under doc_id.
+
+        Raises:
+            UnknownDocumentError: If doc_id is not registered
+        """
+        with self._lock:
+            entry = self._entries.get(doc_id)
+            if entry is not None:
+                self._entries.move_to_end(doc_id)
+                self.memory_hits += 1
+                return entry[0]
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM documents WHERE kind = ? AND id = ?", (self.kind, doc_id)
+            ).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            raise UnknownDocumentError(f"Unknown {self.kind} id {doc_id!r}")
+        record = pickle.loads(row[0])
+        self._remember(doc_id, record, len(row[0]))
+        with self._lock:
+            self.disk_hits += 1
+        return record
+
+    def delete(self, doc_id):
+        """
+        Remove doc_id from the registry.
+
+        Raises:
+            UnknownDocumentError: If doc_id is not registered
+        """
+        with self._lock:
+            entry = self._entries.pop(doc_id, None)
+            if entry is not None:
+                self._size -= entry[1]
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM documents WHERE kind = ? AND id = ?", (self.kind, doc_id)
+            ).rowcount
+        if not deleted:
+            raise UnknownDocumentError(f"Unknown {self.kind} id {doc_id!r}")
+
+    def _remember(self, doc_id, record, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(doc_id, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[doc_id] = (record, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def stats(self):
+        """
+        Return hit/miss counters, memory usage and the number of stored documents.
+        """
+        with self._connect() as conn:
+            stored = conn.execute("SELECT COUNT(*) FROM documents WHERE kind = ?", (self.kind,)).fetchone()[0]
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "documents": stored,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
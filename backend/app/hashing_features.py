@@ -0,0 +1,138 @@
+"""
+Feature-hashing TF-IDF: a stateless alternative to a fitted vocabulary.
+
+Terms are hashed into a fixed number of columns, so featurizing needs no
+vocabulary and memory does not grow with the corpus. IDF weights come from a
+document-frequency table of the same fixed size, maintained separately (see
+tfidf_model.py --hashing / --update-df) and loaded read-only by every worker.
+Column -> term names are rebuilt from the documents being analyzed, so keyword
+output stays readable.
+"""
+import os
+import hashlib
+import numpy as np
+
+# Default number of hashed columns
+DEFAULT_N_FEATURES = 2 ** 20
+
+
+def hasher_params(params):
+    """
+    Keep the VECTORIZER_PARAMS that apply to HashingVectorizer (no document-frequency limits).
+    """
+    return {key: value for key, value in params.items() if key in ("ngram_range", "stop_words", "token_pattern")}
+
+
+def _hashing_vectorizer(n_features, params):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, dtype=np.float64,
+                             **hasher_params(params))
+
+
+class DocumentFrequencyTable:
+    """
+    Number of documents containing each hashed column, plus the document count.
+
+    The table has n_features entries whatever the corpus size. Its version is a
+    digest of the counts, so IDF weights (and results computed with them) are
+    tied to one state of the table.
+    """
+
+    def __init__(self, n_features, params, counts=None, n_documents=0):
+        self.n_features = n_features
+        self.params = hasher_params(params)
+        self.counts = counts if counts is not None else np.zeros(n_features, dtype=np.int64)
+        self.n_documents = n_documents
+
+    @property
+    def version(self):
+        digest = hashlib.sha256(self.counts.tobytes())
+        digest.update(str(self.n_documents).encode())
+        return digest.hexdigest()[:12]
+
+    def update(self, processed_texts):
+        """
+        Count preprocessed documents into the table.
+        """
+        counts = _hashing_vectorizer(self.n_features, self.params).transform(processed_texts).tocsc()
+        self.counts += np.diff(counts.indptr)
+        self.n_documents += counts.shape[0]
+
+    def idf(self):
+        """
+        Return smoothed IDF weights, as TfidfVectorizer computes them.
+        """
+        return np.log((1 + self.n_documents) / (1 + self.counts)) + 1
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, counts=self.counts, n_documents=self.n_documents, n_features=self.n_features)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, params):
+        """
+        Load a table saved by save(); params are the vectorizer settings it was built with.
+        """
+        with np.load(path) as data:
+            return cls(int(data["n_features"]), params, counts=data["counts"].astype(np.int64),
+                       n_documents=int(data["n_documents"]))
+
+
+class HashedFeatureNames:
+    """
+    Column -> term lookup for hashed columns, limited to the terms of given documents.
+
+    Terms that collide in one column are joined with "/". len() is the number of
+    columns, like the feature names of a fitted vocabulary.
+    """
+
+    def __init__(self, n_features, terms_by_column):
+        self.n_features = n_features
+        self._terms = terms_by_column
+
+    def __len__(self):
+        return self.n_features
+
+    def __getitem__(self, column):
+        if isinstance(column, slice):
+            return [self._terms[key] for key in sorted(self._terms)][column]
+        return self._terms.get(int(column), f"feature_{int(column)}")
+
+
+class HashingTfidfVectorizer:
+    """
+    TF-IDF vectorizer over hashed columns with IDF from a DocumentFrequencyTable.
+
+    transform() matches TfidfVectorizer (raw counts x smoothed IDF, then L2
+    normalization) except that columns are hashes instead of vocabulary entries.
+    It keeps no per-document state, so any worker can featurize on its own.
+    """
+
+    def __init__(self, table):
+        self.n_features = table.n_features
+        self._hasher = _hashing_vectorizer(table.n_features, table.params)
+        self._analyzer = self._hasher.build_analyzer()
+        self._idf = table.idf()
+
+    def transform(self, processed_texts):
+        from sklearn.preprocessing import normalize
+        counts = self._hasher.transform(processed_texts).tocsr()
+        counts.data *= self._idf[counts.indices]
+        return normalize(counts, norm="l2", copy=False)
+
+    def feature_names(self, processed_texts):
+        """
+        Return a HashedFeatureNames for the terms of processed_texts.
+        """
+        from sklearn.feature_extraction import FeatureHasher
+        terms = sorted({term for text in processed_texts for term in self._analyzer(text)})
+        terms_by_column = {}
+        if terms:
+            hasher = FeatureHasher(n_features=self.n_features, input_type="string", alternate_sign=False)
+            columns = hasher.transform([[term] for term in terms]).indices
+            for column, term in zip(columns.tolist(), terms):
+                terms_by_column[column] = f"{terms_by_column[column]}/{term}" if column in terms_by_column else term
+        return HashedFeatureNames(self.n_features, terms_by_column)
@@ -1,17 +1,13 @@
 import os
 import sys
-import nltk
-from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('punkt_tab', quiet=True)
-except:
-    pass
+import logging
+import time
+import json
+import uuid
+import asyncio
+from typing import List
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.responses import Response, JSONResponse, PlainTextResponse, StreamingResponse
 
 # Ensure the utils and app directories are in sys.path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,151 +17,813 @@ sys.path.append(os.path.abspath(UTILS_DIR))
 sys.path.append(os.path.abspath(APP_DIR))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))) 
 #This means Python will now look in this upper-level directory when importing modules.
-from backend.utils.pdf_parser import textextractionfunction
-from tfidf_analyzer import analyze_resume_with_tfidf, analyze_job_description_with_tfidf, calculate_resume_job_similarity, comprehensive_resume_job_analysis
+from backend.utils.pdf_parser import extract_document, pdf_text_cache, validate_backend, UnknownBackendError, preload_modules
+from tfidf_analyzer import analyze_resume_with_tfidf, analyze_job_description_with_tfidf, calculate_resume_job_similarity, comprehensive_resume_job_analysis, load_tfidf_model, batch_resume_job_similarity, model_version, prepare_document
+from backend.utils.log_utils import configure_logging, set_request_debug, reset_request_debug
+from backend.utils import metrics, profiler
+from worker_pool import run_in_pool, shutdown_pool, warm_up_pool, defer_pool_start, allow_pool_start, pool_stats, pool_broken, PoolBusyError, POOL_WORKERS
+from resume_index import ResumeIndex, vectorize_documents, require_fitted_model, ModelNotLoadedError
+from task_queue import get_task_store, start_task_workers, stop_task_workers, task_worker_stats, QueueFullError, DONE, FAILED
+from document_registry import DocumentRegistry, UnknownDocumentError, document_id, JOB_REGISTRY_MAX_BYTES, RESUME_REGISTRY_MAX_BYTES
+from analysis_cache import analysis_cache, analysis_key
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# With ALLOW_REQUEST_DEBUG=1, clients can send "X-Debug-Trace: 1" to get detailed
+# DEBUG traces for one request. Off by default: the traces include resume text.
+ALLOW_REQUEST_DEBUG = os.getenv("ALLOW_REQUEST_DEBUG", "").lower() in ("1", "true", "yes")
+
+@app.middleware("http")
+async def request_debug_switch(request: Request, call_next):
+    enabled = ALLOW_REQUEST_DEBUG and request.headers.get("x-debug-trace", "").lower() in ("1", "true", "yes")
+    token = set_request_debug(enabled)
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_debug(token)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # Per-stage timings of this request end up in the Server-Timing header
+    start = time.perf_counter()
+    token = metrics.start_request_timings()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        timings = metrics.finish_request_timings(token)
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        metrics.observe_request(route.path if route else "unmatched", status, elapsed)
+    response.headers["Server-Timing"] = ", ".join(
+        filter(None, [metrics.server_timing_header(timings), f"total;dur={elapsed * 1000:.1f}"])
+    )
+    return response
+
+@app.middleware("http")
+async def profile_switch(request: Request, call_next):
+    # With PROFILING_ENABLED=1, "X-Profile: 1" profiles this request; fetch the result
+    # from /profiles/{X-Profile-Id}. The event loop thread is shared, so samples taken
+    # there can include other requests handled at the same time.
+    if not (profiler.PROFILING_ENABLED and request.headers.get("x-profile", "").lower() in ("1", "true", "yes")):
+        return await call_next(request)
+    with profiler.profile_request(request.url.path) as profile:
+        response = await call_next(request)
+    response.headers["X-Profile-Id"] = profile.profile_id
+    return response
+
+# Set SAVE_EXTRACTED_TEXT=1 to dump every extracted text to OUTPUT_DIR for debugging.
+SAVE_EXTRACTED_TEXT = os.getenv("SAVE_EXTRACTED_TEXT", "").lower() in ("1", "true", "yes")
 OUTPUT_DIR = os.path.join(UTILS_DIR, 'output')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+if SAVE_EXTRACTED_TEXT:
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Largest /match-batch/ request: resumes (files plus ids) and job descriptions
+# (files, texts plus ids). The whole N x M matrix is scored in one pool task.
+MAX_BATCH_RESUMES = int(os.getenv("MAX_BATCH_RESUMES", "100"))
+MAX_BATCH_JOBS = int(os.getenv("MAX_BATCH_JOBS", "100"))
+
+# Vectors of resumes ingested through /index-resume/, ranked by /rank-resumes
+resume_index = ResumeIndex()
+
+# Job descriptions registered through /job-descriptions, matched by job_id
+job_registry = DocumentRegistry("job", max_bytes=JOB_REGISTRY_MAX_BYTES)
+# Resumes uploaded once through /resumes, matched by resume_id without re-extraction
+resume_registry = DocumentRegistry("resume", max_bytes=RESUME_REGISTRY_MAX_BYTES)
+
+# Readiness, reported by /ready once warm_up() has finished
+warm_up_state = {"ready": False, "error": None, "seconds": None}
+
+# Tiny documents run through the analyzer once so its code paths are loaded
+WARM_UP_TEXT = "python developer with machine learning and data analysis experience"
+
+def preload():
+    # Load the corpus-fitted TF-IDF model once; worker processes inherit it
+    load_tfidf_model()
+    preload_modules()
+    comprehensive_resume_job_analysis(WARM_UP_TEXT, WARM_UP_TEXT)
+
+async def warm_up():
+    """
+    Preload the model, extraction backends and analyzer, then start the worker
+    pool, so the first requests don't pay for it.
+
+    Preloading runs in a thread so /live answers meanwhile, and the pool workers
+    are forked only once it has finished: forking while another thread is
+    importing modules can deadlock the children. Pool tasks of requests arriving
+    in the meantime wait for the pool (see defer_pool_start). A failure is
+    reported by /ready instead of stopping the server.
+    """
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(preload)
+        await warm_up_pool()
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        warm_up_state["error"] = str(e)
+        return
+    finally:
+        allow_pool_start()
+    warm_up_state["seconds"] = round(time.perf_counter() - start, 3)
+    warm_up_state["ready"] = True
+    logger.info("Warm-up finished in %.2fs", warm_up_state["seconds"])
+
+@app.on_event("startup")
+async def start_warm_up():
+    # In the background, so the server accepts connections (/live, /ready) right away
+    defer_pool_start()
+    app.state.warm_up_task = asyncio.create_task(warm_up())
+
+@app.on_event("startup")
+def start_background_workers():
+    # Workers requeue tasks abandoned by crashed workers themselves (see TaskStore.recover)
+    start_task_workers(get_task_store())
+
+@app.on_event("shutdown")
+def stop_worker_pool():
+    app.state.warm_up_task.cancel()
+    stop_task_workers()
+    shutdown_pool()
+
+def busy_response(e):
+    return JSONResponse(status_code=503, content={"error": str(e)})
+
+def bad_request_response(e):
+    return JSONResponse(status_code=400, content={"error": str(e)})
+
+async def extract_upload(file, pdf_backend=None):
+    """
+    Extract an uploaded PDF in memory, without writing it to disk.
+    Repeat uploads of the same PDF are served from pdf_text_cache.
+
+    Args:
+        file (UploadFile): Uploaded PDF
+        pdf_backend (str, optional): Text-layer backend name or "auto"
+
+    Returns:
+        dict: "text", "page_count", "ocr_pages" and "backend" (see extract_document)
+    """
+    validate_backend(pdf_backend)
+    with metrics.stage("upload_read"):
+        content = await file.read()
+    cache_key = pdf_text_cache.make_key(content, pdf_backend)
+    # The disk tier (PDF_CACHE_DIR) reads and writes files, so keep it off the event loop
+    cached_document = await asyncio.to_thread(pdf_text_cache.get, cache_key)
+    if cached_document is not None:
+        return cached_document
+    output_path = None
+    if SAVE_EXTRACTED_TEXT:
+        # Unique prefix so concurrent uploads with the same filename don't collide
+        filename = os.path.basename(file.filename or "upload.pdf")
+        output_path = os.path.join(OUTPUT_DIR, f"{uuid.uuid4().hex}-{filename}.txt")
+    document = await run_in_pool(extract_document, content, output_path, pdf_backend)
+    # A time-budget cut-off depends on load, so don't let it stick in the cache
+    if document["truncated"] != "time_budget":
+        await asyncio.to_thread(pdf_text_cache.put, cache_key, document)
+    return document
+
+async def get_registered(registry, doc_id):
+    """
+    Return a registered document, re-preparing it if it was registered under
+    another TF-IDF model.
+
+    Raises:
+        UnknownDocumentError: If doc_id is not registered
+    """
+    record = await asyncio.to_thread(registry.get, doc_id)
+    if record["model_version"] != model_version():
+        record = dict(record, **await run_in_pool(prepare_document, record["text"]))
+        await asyncio.to_thread(registry.put, doc_id, record)
+    return record
+
+async def get_job_description(job_id):
+    return await get_registered(job_registry, job_id)
+
+async def get_resume(file, resume_id, pdf_backend=None):
+    """
+    Return the resume of a request, either extracted from the uploaded file or
+    taken from resume_registry.
+
+    Returns:
+        tuple: (resume text, OCR'd pages, prepared resume or None for an upload)
+
+    Raises:
+        UnknownDocumentError: If resume_id is not registered
+    """
+    if file is not None:
+        resume = await extract_upload(file, pdf_backend)
+        return resume["text"], resume["ocr_pages"], None
+    record = await get_registered(resume_registry, resume_id)
+    return record["text"], record["ocr_pages"], record
+
+def model_not_loaded_response(e):
+    return JSONResponse(status_code=503, content={"error": str(e)})
+
+def unknown_document_response(e):
+    return JSONResponse(status_code=404, content={"error": str(e)})
+
+def etag_matches(request, etag):
+    """
+    Return True if the If-None-Match header of request lists etag (weak comparison).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+def not_modified_response(etag):
+    metrics.increment("not_modified_total")
+    return Response(status_code=304, headers={"ETag": etag})
+
+async def cached_analysis(key, resume_text, job_description_text, job=None, resume=None):
+    """
+    Run comprehensive_resume_job_analysis, or return its cached result for key
+    (see analysis_key). Prepared documents are passed on instead of their text.
+    """
+    result = analysis_cache.get(key)
+    if result is None:
+        result = await run_in_pool(
+            comprehensive_resume_job_analysis,
+            None if resume else resume_text, None if job else job_description_text, job, resume
+        )
+        if "error" not in result:
+            analysis_cache.put(key, result)
+    return result
 
 @app.post("/analyze-resume/")
-async def analyze_resume(file: UploadFile = File(...)):
-    try:
-        file_path = os.path.join(OUTPUT_DIR, file.filename)
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        output_path = os.path.join(OUTPUT_DIR, f"{file.filename}.txt")
-        resume_text = textextractionfunction(file_path, output_path)
-        tfidf_result = analyze_resume_with_tfidf(resume_text)
-        try:
-            os.remove(file_path)
-            os.remove(output_path)
-        except Exception:
-            pass
+async def analyze_resume(file: UploadFile = File(None), resume_id: str = Form(None), pdf_backend: str = Form(None)):
+    try:
+        if file is None and resume_id is None:
+            return JSONResponse(status_code=400, content={"error": "Provide file or resume_id"})
+        resume_text, ocr_pages, resume = await get_resume(file, resume_id, pdf_backend)
+        if resume is not None:
+            tfidf_result = resume["keywords"]
+        else:
+            tfidf_result = await run_in_pool(analyze_resume_with_tfidf, resume_text)
         return JSONResponse(content={
             "extracted_text": resume_text,
+            "ocr_pages": ocr_pages,
+            "resume_id": resume_id,
             "tfidf_analysis": tfidf_result
         })
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
 
 @app.post("/analyze-job-description/")
 async def analyze_job_description(job_description: str = Form(...)):
     try:
-        tfidf_result = analyze_job_description_with_tfidf(job_description)
+        tfidf_result = await run_in_pool(analyze_job_description_with_tfidf, job_description)
         return JSONResponse(content={
             "job_description_text": job_description,
             "tfidf_analysis": tfidf_result
         })
+    except PoolBusyError as e:
+        return busy_response(e)
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
 
 @app.post("/match-resume-job/")
 async def match_resume_job(
-    file: UploadFile = File(...),
-    job_description: str = Form(...)
+    request: Request,
+    file: UploadFile = File(None),
+    resume_id: str = Form(None),
+    job_description: str = Form(None),
+    job_id: str = Form(None),
+    pdf_backend: str = Form(None)
 ):
+    """
+    Match a resume against a job description. The response carries an ETag of
+    the inputs and model version; a request with a matching If-None-Match gets
+    304 without the analysis being run.
+    """
     try:
-        # Extract resume text
-        file_path = os.path.join(OUTPUT_DIR, file.filename)
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        output_path = os.path.join(OUTPUT_DIR, f"{file.filename}.txt")
-        resume_text = textextractionfunction(file_path, output_path)
+        if file is None and resume_id is None:
+            return JSONResponse(status_code=400, content={"error": "Provide file or resume_id"})
+        if job_description is None and job_id is None:
+            return JSONResponse(status_code=400, content={"error": "Provide job_description or job_id"})
+        # Extract resume text, or take the registered resume
+        resume_text, ocr_pages, resume = await get_resume(file, resume_id, pdf_backend)
         
-        # Perform comprehensive analysis
-        analysis_result = comprehensive_resume_job_analysis(resume_text, job_description)
-        
-        # Cleanup
-        try:
-            os.remove(file_path)
-            os.remove(output_path)
-        except Exception:
-            pass
+        # Perform comprehensive analysis, reusing registered documents' vectors
+        job = None
+        if job_id is not None:
+            job = await get_job_description(job_id)
+            job_description = job["text"]
+        key = analysis_key(resume_text, job_description, model_version())
+        etag = f'W/"{key}"'
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        analysis_result = await cached_analysis(key, resume_text, job_description, job, resume)
             
-        return JSONResponse(content={
+        return JSONResponse(headers={"ETag": etag}, content={
             "resume_text": resume_text,
+            "resume_ocr_pages": ocr_pages,
+            "resume_id": resume_id,
             "job_description_text": job_description,
+            "job_id": job_id,
             "analysis": analysis_result
         })
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
 
 @app.post("/analyze-job-description-pdf/")
-async def analyze_job_description_pdf(file: UploadFile = File(...)):
+async def analyze_job_description_pdf(file: UploadFile = File(...), pdf_backend: str = Form(None)):
     try:
-        # Save uploaded file
-        file_path = os.path.join(OUTPUT_DIR, file.filename)
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
         # Extract text from PDF
-        output_path = os.path.join(OUTPUT_DIR, f"{file.filename}.txt")
-        job_description_text = textextractionfunction(file_path, output_path)
+        job_description = await extract_upload(file, pdf_backend)
+        job_description_text = job_description["text"]
         
         # Analyze with TF-IDF
-        tfidf_result = analyze_job_description_with_tfidf(job_description_text)
-        
-        # Cleanup files
-        try:
-            os.remove(file_path)
-            os.remove(output_path)
-        except Exception:
-            pass
+        tfidf_result = await run_in_pool(analyze_job_description_with_tfidf, job_description_text)
         
         return JSONResponse(content={
             "extracted_text": job_description_text,
+            "ocr_pages": job_description["ocr_pages"],
             "tfidf_analysis": tfidf_result
         })
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
 
 @app.post("/match-resume-job-pdf/")
 async def match_resume_job_pdf(
-    file: UploadFile = File(...),
-    jd_file: UploadFile = File(...)
+    request: Request,
+    file: UploadFile = File(None),
+    jd_file: UploadFile = File(...),
+    resume_id: str = Form(None),
+    pdf_backend: str = Form(None)
 ):
     try:
-        # Extract resume text
-        resume_file_path = os.path.join(OUTPUT_DIR, file.filename)
-        with open(resume_file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        resume_output_path = os.path.join(OUTPUT_DIR, f"{file.filename}.txt")
-        resume_text = textextractionfunction(resume_file_path, resume_output_path)
-        
-        # Extract job description text
-        jd_file_path = os.path.join(OUTPUT_DIR, jd_file.filename)
-        with open(jd_file_path, "wb") as f:
-            content = await jd_file.read()
-            f.write(content)
-        jd_output_path = os.path.join(OUTPUT_DIR, f"{jd_file.filename}.txt")
-        job_description_text = textextractionfunction(jd_file_path, jd_output_path)
+        if file is None and resume_id is None:
+            return JSONResponse(status_code=400, content={"error": "Provide file or resume_id"})
+        # Extract resume and job description text concurrently
+        (resume_text, ocr_pages, resume), job_description = await asyncio.gather(
+            get_resume(file, resume_id, pdf_backend),
+            extract_upload(jd_file, pdf_backend)
+        )
+        job_description_text = job_description["text"]
         
-        # Perform comprehensive analysis
-        analysis_result = comprehensive_resume_job_analysis(resume_text, job_description_text)
-        
-        # Cleanup files
-        try:
-            os.remove(resume_file_path)
-            os.remove(resume_output_path)
-            os.remove(jd_file_path)
-            os.remove(jd_output_path)
-        except Exception:
-            pass
+        # Perform comprehensive analysis unless the client already has the result
+        key = analysis_key(resume_text, job_description_text, model_version())
+        etag = f'W/"{key}"'
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        analysis_result = await cached_analysis(key, resume_text, job_description_text, None, resume)
             
-        return JSONResponse(content={
+        return JSONResponse(headers={"ETag": etag}, content={
             "resume_text": resume_text,
             "job_description_text": job_description_text,
+            "resume_ocr_pages": ocr_pages,
+            "job_description_ocr_pages": job_description["ocr_pages"],
+            "resume_id": resume_id,
             "analysis": analysis_result
         })
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+@app.post("/match-batch/")
+async def match_batch(
+    resumes: List[UploadFile] = File(None),
+    resume_ids: List[str] = Form(None),
+    job_descriptions: List[UploadFile] = File(None),
+    job_description_texts: List[str] = Form(None),
+    job_ids: List[str] = Form(None),
+    top_terms: int = Form(5),
+    pdf_backend: str = Form(None)
+):
+    """
+    Score every resume (uploaded and/or registered) against every job
+    description (PDFs, texts and/or registered job ids). Batches over
+    MAX_BATCH_RESUMES or MAX_BATCH_JOBS are rejected with 413.
+    """
+    try:
+        resumes = resumes or []
+        resume_ids = resume_ids or []
+        if not resumes and not resume_ids:
+            return JSONResponse(status_code=400, content={"error": "Provide resumes files or resume_ids"})
+        job_descriptions = job_descriptions or []
+        job_description_texts = job_description_texts or []
+        job_ids = job_ids or []
+        if not job_descriptions and not job_description_texts and not job_ids:
+            return JSONResponse(status_code=400, content={"error": "Provide job_descriptions files, job_description_texts or job_ids"})
+        resume_count = len(resumes) + len(resume_ids)
+        job_count = len(job_descriptions) + len(job_description_texts) + len(job_ids)
+        if resume_count > MAX_BATCH_RESUMES or job_count > MAX_BATCH_JOBS:
+            return JSONResponse(status_code=413, content={
+                "error": f"Batch too large: {resume_count} resumes and {job_count} job descriptions "
+                         f"(at most {MAX_BATCH_RESUMES} and {MAX_BATCH_JOBS})"
+            })
+        validate_backend(pdf_backend)
+        registered_resumes = [await asyncio.to_thread(resume_registry.get, resume_id) for resume_id in resume_ids]
+        registered_jobs = [await asyncio.to_thread(job_registry.get, job_id) for job_id in job_ids]
+
+        # Extract every PDF once, keeping at most POOL_WORKERS extractions in flight
+        # so one batch doesn't fill the whole pool queue
+        limit = asyncio.Semaphore(POOL_WORKERS)
+        async def extract(file):
+            async with limit:
+                return await extract_upload(file, pdf_backend)
+        documents = await asyncio.gather(*(extract(f) for f in list(resumes) + list(job_descriptions)))
+        resume_texts = [doc["text"] for doc in documents[:len(resumes)]] + [doc["text"] for doc in registered_resumes]
+        job_texts = [doc["text"] for doc in documents[len(resumes):]] + list(job_description_texts)
+        job_texts += [job["text"] for job in registered_jobs]
+
+        result = await run_in_pool(batch_resume_job_similarity, resume_texts, job_texts, top_terms)
+        return JSONResponse(content={
+            "resumes": [f.filename for f in resumes] + list(resume_ids),
+            "job_descriptions": [f.filename for f in job_descriptions] + [f"text-{i + 1}" for i in range(len(job_description_texts))] + list(job_ids),
+            "analysis": result
+        })
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+@app.post("/index-resume/")
+async def index_resume(
+    file: UploadFile = File(None),
+    resume_id: str = Form(None),
+    pdf_backend: str = Form(None)
+):
+    """
+    Add a resume to resume_index: an uploaded PDF (indexed under resume_id, or a
+    new id), or without a file, the registered resume resume_id.
+    """
+    try:
+        if file is None and resume_id is None:
+            return JSONResponse(status_code=400, content={"error": "Provide file or resume_id"})
+        if file is None:
+            # Registered without the model, so there is no vector to index
+            vector = require_fitted_model((await get_registered(resume_registry, resume_id))["vector"])
+        else:
+            resume = await extract_upload(file, pdf_backend)
+            vector = await run_in_pool(vectorize_documents, [resume["text"]])
+            resume_id = resume_id or uuid.uuid4().hex
+        resume_index.add(resume_id, vector)
+        return JSONResponse(content={
+            "resume_id": resume_id,
+            "indexed_resumes": len(resume_index)
+        })
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except ModelNotLoadedError as e:
+        return model_not_loaded_response(e)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+@app.post("/rank-resumes")
+async def rank_resumes(job_description: str = Form(None), job_id: str = Form(None), top_k: int = Form(10)):
+    try:
+        if job_description is None and job_id is None:
+            return JSONResponse(status_code=400, content={"error": "Provide job_description or job_id"})
+        if job_id is not None:
+            job = await get_job_description(job_id)
+            job_description, job_vector = job["text"], require_fitted_model(job["vector"])
+        else:
+            job_vector = await run_in_pool(vectorize_documents, [job_description])
+        ranking = await asyncio.to_thread(resume_index.rank, job_vector, top_k)
+        return JSONResponse(content={
+            "job_description_text": job_description,
+            "job_id": job_id,
+            "indexed_resumes": len(resume_index),
+            "ranking": ranking
+        })
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except ModelNotLoadedError as e:
+        return model_not_loaded_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+def resume_response(resume_id, resume, registered=False, indexed=False):
+    return {
+        "resume_id": resume_id,
+        "registered": registered,
+        "indexed": indexed or resume_id in resume_index,
+        "extracted_text": resume["text"],
+        "page_count": resume["page_count"],
+        "ocr_pages": resume["ocr_pages"],
+        "model_version": resume["model_version"],
+        "tfidf_analysis": resume["keywords"],
+    }
+
+@app.post("/resumes")
+async def register_resume(
+    file: UploadFile = File(...),
+    index: bool = Form(False),
+    pdf_backend: str = Form(None)
+):
+    """
+    Register a resume PDF once for matching by resume_id.
+
+    The PDF is extracted, and its normalized text, TF-IDF vector and keywords are
+    computed here, so later matches skip extraction. The id is derived from the
+    extracted text; registering the same resume again returns the existing entry.
+    A PDF without any extractable text is rejected with 422.
+    With index=true the resume is also added to resume_index for /rank-resumes
+    (needs the corpus-fitted model).
+    """
+    try:
+        document = await extract_upload(file, pdf_backend)
+        if not document["text"].strip():
+            # Every such PDF would get the same id and overwrite each other's entry
+            return JSONResponse(status_code=422, content={"error": "No text could be extracted from the resume"})
+        resume_id = document_id(document["text"])
+        try:
+            resume = await get_registered(resume_registry, resume_id)
+            registered = False
+        except UnknownDocumentError:
+            resume = await run_in_pool(prepare_document, document["text"])
+            resume.update(page_count=document["page_count"], ocr_pages=document["ocr_pages"])
+            await asyncio.to_thread(resume_registry.put, resume_id, resume)
+            registered = True
+        indexed = False
+        if index and resume["vector"] is not None:
+            resume_index.add(resume_id, resume["vector"])
+            indexed = True
+        return resume_response(resume_id, resume, registered, indexed)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+@app.get("/resumes/{resume_id}")
+async def get_registered_resume(resume_id: str):
+    try:
+        return resume_response(resume_id, await get_registered(resume_registry, resume_id))
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+
+@app.delete("/resumes/{resume_id}")
+async def delete_resume(resume_id: str):
+    try:
+        await asyncio.to_thread(resume_registry.delete, resume_id)
+        resume_index.remove(resume_id)
+        return {"resume_id": resume_id, "deleted": True}
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+
+def job_description_response(job_id, job, registered=False):
+    return {
+        "job_id": job_id,
+        "registered": registered,
+        "job_description_text": job["text"],
+        "ocr_pages": job.get("ocr_pages") or [],
+        "model_version": job["model_version"],
+        "tfidf_analysis": job["keywords"],
+    }
+
+@app.post("/job-descriptions")
+async def register_job_description(
+    job_description: str = Form(None),
+    file: UploadFile = File(None),
+    pdf_backend: str = Form(None)
+):
+    """
+    Register a job description (text or PDF) for repeat matching by job_id.
+
+    Its normalized text, TF-IDF vector and keywords are computed once here. The
+    id is derived from the text, so registering the same text again returns the
+    existing entry.
+    """
+    try:
+        if job_description is None and file is None:
+            return JSONResponse(status_code=400, content={"error": "Provide job_description or file"})
+        ocr_pages = []
+        if file is not None:
+            document = await extract_upload(file, pdf_backend)
+            job_description, ocr_pages = document["text"], document["ocr_pages"]
+        job_id = document_id(job_description)
+        try:
+            job = await get_job_description(job_id)
+            return job_description_response(job_id, job)
+        except UnknownDocumentError:
+            pass
+        job = await run_in_pool(prepare_document, job_description)
+        job["ocr_pages"] = ocr_pages
+        await asyncio.to_thread(job_registry.put, job_id, job)
+        return job_description_response(job_id, job, registered=True)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+@app.get("/job-descriptions/{job_id}")
+async def get_registered_job_description(job_id: str):
+    try:
+        return job_description_response(job_id, await get_job_description(job_id))
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+    except PoolBusyError as e:
+        return busy_response(e)
+
+@app.delete("/job-descriptions/{job_id}")
+async def delete_job_description(job_id: str):
+    try:
+        await asyncio.to_thread(job_registry.delete, job_id)
+        return {"job_id": job_id, "deleted": True}
+    except UnknownDocumentError as e:
+        return unknown_document_response(e)
+
+def task_accepted_response(task_id):
+    return JSONResponse(status_code=202, content={
+        "task_id": task_id,
+        "status": "queued",
+        "status_url": f"/tasks/{task_id}",
+        "events_url": f"/tasks/{task_id}/events",
+        "result_url": f"/tasks/{task_id}/result",
+    })
+
+@app.post("/tasks/extract")
+async def submit_extract_task(file: UploadFile = File(...), pdf_backend: str = Form(None)):
+    """
+    Queue a PDF extraction; the result is what extract_document returns.
+    """
+    try:
+        validate_backend(pdf_backend)
+        content = await file.read()
+        task_id = await asyncio.to_thread(
+            get_task_store().submit, "extract", {"pdf_backend": pdf_backend}, {"file": content}
+        )
+        return task_accepted_response(task_id)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except QueueFullError as e:
+        return busy_response(e)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
+
+@app.post("/tasks/match")
+async def submit_match_task(
+    file: UploadFile = File(...),
+    job_description: str = Form(None),
+    jd_file: UploadFile = File(None),
+    pdf_backend: str = Form(None)
+):
+    """
+    Queue a resume/job description match; the result has the same fields as
+    /match-resume-job/ (or /match-resume-job-pdf/ when jd_file is given).
+    """
+    try:
+        if job_description is None and jd_file is None:
+            return JSONResponse(status_code=400, content={"error": "Provide job_description or jd_file"})
+        validate_backend(pdf_backend)
+        files = {"file": await file.read()}
+        if jd_file is not None:
+            files["jd_file"] = await jd_file.read()
+        params = {"pdf_backend": pdf_backend, "job_description": job_description}
+        task_id = await asyncio.to_thread(get_task_store().submit, "match", params, files)
+        return task_accepted_response(task_id)
+    except UnknownBackendError as e:
+        return bad_request_response(e)
+    except QueueFullError as e:
+        return busy_response(e)
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Processing failed: {str(e)}"})
 
+def unknown_task_response(task_id):
+    return JSONResponse(status_code=404, content={"error": f"Unknown task {task_id}"})
+
+@app.get("/tasks")
+def task_stats():
+    return {"tasks": get_task_store().stats(), "workers": task_worker_stats()}
+
+@app.get("/tasks/{task_id}")
+def task_status(task_id: str):
+    task = get_task_store().get(task_id)
+    return task if task is not None else unknown_task_response(task_id)
+
+@app.get("/tasks/{task_id}/result")
+def task_result(task_id: str):
+    task = get_task_store().get(task_id, with_result=True)
+    if task is None:
+        return unknown_task_response(task_id)
+    if task["status"] == FAILED:
+        return JSONResponse(status_code=500, content={"error": f"Processing failed: {task['error']}"})
+    if task["status"] != DONE:
+        # Not finished yet: same body as /tasks/{task_id}
+        return JSONResponse(status_code=202, content=task)
+    return task["result"]
+
+# Seconds between two status checks of a task event stream, and between keep-alive comments
+TASK_EVENT_INTERVAL = 0.5
+TASK_EVENT_KEEPALIVE = 15
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(task_id: str):
+    """
+    Server-sent events: a "progress" event whenever the task status changes, then
+    a final "done" or "failed" event, or "gone" if the task was deleted meanwhile.
+    """
+    store = get_task_store()
+    if await asyncio.to_thread(store.get, task_id) is None:
+        return unknown_task_response(task_id)
+
+    async def stream():
+        last_state, last_sent = None, time.monotonic()
+        while True:
+            task = await asyncio.to_thread(store.get, task_id)
+            if task is None:
+                # Purged by retention (see TaskStore.recover)
+                yield f"event: gone\ndata: {json.dumps({'task_id': task_id})}\n\n"
+                return
+            state = (task["status"], task["progress"], task["message"], task["queue_position"])
+            finished = task["status"] in (DONE, FAILED)
+            if state != last_state:
+                last_state, last_sent = state, time.monotonic()
+                event = task["status"] if finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(task)}\n\n"
+            elif time.monotonic() - last_sent > TASK_EVENT_KEEPALIVE:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            if finished:
+                return
+            await asyncio.sleep(TASK_EVENT_INTERVAL)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render_metrics(pool_stats()), media_type="text/plain; version=0.0.4")
+
+@app.get("/profiles")
+def list_profiles():
+    return {"enabled": profiler.PROFILING_ENABLED, "profiles": profiler.profile_store.list()}
+
+@app.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, format: str = "collapsed"):
+    """
+    Return a stored request profile as collapsed stacks (for flame graphs) or as a JSON summary.
+    """
+    profile = profiler.profile_store.get(profile_id)
+    if profile is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown profile {profile_id}"})
+    if format == "json":
+        return dict(profile.to_dict(), stacks=dict(profile.stacks))
+    return PlainTextResponse(profile.collapsed())
+
+@app.get("/cache-stats")
+def cache_stats():
+    return {"pdf_text_cache": pdf_text_cache.stats(), "job_registry": job_registry.stats(),
+            "resume_registry": resume_registry.stats(), "analysis_cache": analysis_cache.stats()}
+
+@app.get("/live")
+def live():
+    return {"status": "alive"}
+
+@app.get("/ready")
+def ready():
+    if warm_up_state["ready"] and pool_broken():
+        # Rebuilt by the next pool task; until then pool-backed endpoints can't answer
+        return JSONResponse(status_code=503, content={"status": "pool_broken"})
+    if warm_up_state["ready"]:
+        return {"status": "ready", "warm_up_seconds": warm_up_state["seconds"], "model_version": model_version()}
+    if warm_up_state["error"]:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": warm_up_state["error"]})
+    return JSONResponse(status_code=503, content={"status": "warming_up"})
+
 @app.get("/")
 def home():
     return {"message": "Resume Analyzer API is running!"}
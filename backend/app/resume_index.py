@@ -0,0 +1,162 @@
+import threading
+import numpy as np
+from tfidf_analyzer import preprocess_text, get_tfidf_model, match_quality_label
+
+
+class ModelNotLoadedError(RuntimeError):
+    """Raised when an operation needs the corpus-fitted TF-IDF model and none is loaded."""
+
+
+def require_fitted_model(value):
+    """
+    Return value (the corpus-fitted model, or a vector computed with it), raising
+    ModelNotLoadedError if it is None because no such model was loaded.
+    """
+    if value is None:
+        raise ModelNotLoadedError(
+            "Resume ranking needs a corpus-fitted TF-IDF model; fit one with backend/app/tfidf_model.py"
+        )
+    return value
+
+
+def vectorize_documents(texts):
+    """
+    Transform raw texts with the corpus-fitted TF-IDF model.
+
+    Rows are L2-normalized, so the dot product of two rows is their cosine
+    similarity, the same score calculate_resume_job_similarity reports when the
+    model is loaded.
+
+    Args:
+        texts (list): Raw resume or job description texts
+
+    Returns:
+        scipy.sparse.csr_matrix: One row per text
+
+    Raises:
+        ModelNotLoadedError: If no TF-IDF model is loaded
+    """
+    model = require_fitted_model(get_tfidf_model())
+    return model["vectorizer"].transform([preprocess_text(text) for text in texts]).tocsr()
+
+
+class ResumeIndex:
+    """
+    In-memory index of resume TF-IDF vectors stored as one sparse CSR matrix.
+
+    Rows are appended to a pending list and stacked into the CSR matrix lazily,
+    so ingesting many resumes doesn't rebuild the matrix each time.
+    """
+
+    def __init__(self):
+        self._ids = []
+        self._positions = {}
+        self._matrix = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._positions
+
+    def add(self, resume_id, vector):
+        """
+        Add or replace the vector of a resume.
+
+        Args:
+            resume_id (str): Resume identifier
+            vector (scipy.sparse matrix): 1 x n_features TF-IDF row
+        """
+        import scipy.sparse as sp
+        with self._lock:
+            if resume_id in self._positions:
+                self._flush()
+                self._matrix = self._replace_row(self._matrix, self._positions[resume_id], vector)
+                return
+            self._positions[resume_id] = len(self._ids)
+            self._ids.append(resume_id)
+            self._pending.append(sp.csr_matrix(vector))
+
+    def remove(self, resume_id):
+        """
+        Drop a resume from the index. Returns False if it wasn't indexed.
+        """
+        with self._lock:
+            position = self._positions.pop(resume_id, None)
+            if position is None:
+                return False
+            self._flush()
+            keep = np.ones(self._matrix.shape[0], dtype=bool)
+            keep[position] = False
+            self._matrix = self._matrix[keep]
+            del self._ids[position]
+            self._positions = {rid: i for i, rid in enumerate(self._ids)}
+            return True
+
+    @staticmethod
+    def _replace_row(matrix, position, vector):
+        import scipy.sparse as sp
+        rows = [matrix[:position], sp.csr_matrix(vector), matrix[position + 1:]]
+        return sp.vstack(rows, format="csr")
+
+    def _flush(self):
+        if self._pending:
+            import scipy.sparse as sp
+            blocks = ([self._matrix] if self._matrix is not None else []) + self._pending
+            self._matrix = sp.vstack(blocks, format="csr")
+            self._pending = []
+
+    def rank(self, job_vector, top_k=10):
+        """
+        Score every indexed resume against a job description vector.
+
+        Uses a single sparse matrix-vector product and a partial sort, so only
+        the top_k scores are fully ordered.
+
+        Args:
+            job_vector (scipy.sparse matrix): 1 x n_features TF-IDF row of the JD
+            top_k (int): Number of resumes to return
+
+        Returns:
+            list: [{"resume_id", "similarity_score", "match_quality"}] best first
+        """
+        with self._lock:
+            self._flush()
+            if self._matrix is None or not self._ids:
+                return []
+            scores = np.asarray((self._matrix @ job_vector.T).todense()).ravel()
+            ids = list(self._ids)
+
+        top_k = max(0, min(top_k, len(scores)))
+        if top_k == 0:
+            return []
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            {
+                "resume_id": ids[i],
+                "similarity_score": round(float(scores[i]), 4),
+                "match_quality": match_quality_label(scores[i]),
+            }
+            for i in order
+        ]
+
+    def stats(self):
+        """
+        Return the number of indexed resumes and the index memory footprint.
+        """
+        with self._lock:
+            self._flush()
+            nbytes = 0
+            if self._matrix is not None:
+                nbytes = self._matrix.data.nbytes + self._matrix.indices.nbytes + self._matrix.indptr.nbytes
+            return {
+                "resumes": len(self._ids),
+                "nonzeros": int(self._matrix.nnz) if self._matrix is not None else 0,
+                "matrix_bytes": int(nbytes),
+            }
@@ -0,0 +1,467 @@
+"""
+Persistent background task queue for long-running extraction and matching.
+
+Tasks and their input files are stored in a local SQLite database, so queued work
+survives restarts. Worker processes started with the API (TASK_WORKERS) claim
+tasks one at a time, report progress in the database and store the result as JSON.
+
+A worker can also run on its own, next to the API or on another host sharing the
+database file:
+    python backend/app/task_queue.py
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import signal
+import logging
+import threading
+import sqlite3
+import multiprocessing
+from contextlib import contextmanager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from backend.utils.pdf_parser import extract_document_cached, validate_backend
+from backend.utils.log_utils import configure_logging
+from tfidf_analyzer import comprehensive_resume_job_analysis
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding queued, running and finished tasks
+TASK_DB_PATH = os.getenv(
+    "TASK_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tasks.sqlite3")
+)
+# Worker processes started with the API (0 leaves execution to standalone workers)
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "1"))
+# Submissions are rejected once this many tasks are waiting
+TASK_QUEUE_MAX = int(os.getenv("TASK_QUEUE_MAX", "1000"))
+# Finished tasks older than this many seconds are deleted when workers start
+TASK_RETENTION_SECONDS = int(os.getenv("TASK_RETENTION_SECONDS", str(7 * 24 * 3600)))
+# Seconds an idle worker waits before looking for new tasks
+TASK_POLL_INTERVAL = float(os.getenv("TASK_POLL_INTERVAL", "0.5"))
+# A running task whose worker has not renewed its lease for this many seconds is
+# considered abandoned (worker crashed or host lost) and is queued again
+TASK_LEASE_SECONDS = float(os.getenv("TASK_LEASE_SECONDS", "120"))
+# Extraction time budget for background tasks (0 = none: they are not bound by HTTP timeouts)
+TASK_TIME_BUDGET = float(os.getenv("TASK_TIME_BUDGET", "0"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    lease TEXT,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, seq);
+CREATE TABLE IF NOT EXISTS task_files (
+    task_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (task_id, name)
+);
+"""
+
+
+class QueueFullError(RuntimeError):
+    """Raised when TASK_QUEUE_MAX tasks are already waiting."""
+
+
+class UnknownTaskKindError(ValueError):
+    """Raised when a task kind is not in TASK_HANDLERS."""
+
+
+class TaskStore:
+    """
+    SQLite-backed storage of tasks, their input files and results.
+
+    A connection is opened per operation, so one store can be shared by threads
+    and every process opens the same file safely (WAL mode).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or TASK_DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # Databases created before leases were added
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(tasks)")]
+            if "heartbeat_at" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN heartbeat_at REAL")
+            if "lease" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN lease TEXT")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, kind, params, files=None):
+        """
+        Queue a task.
+
+        Args:
+            kind (str): One of TASK_HANDLERS
+            params (dict): JSON-serializable task parameters
+            files (dict, optional): {name: bytes} input files
+
+        Returns:
+            str: The task id
+
+        Raises:
+            UnknownTaskKindError: If kind has no handler
+            QueueFullError: If TASK_QUEUE_MAX tasks are already queued
+        """
+        if kind not in TASK_HANDLERS:
+            raise UnknownTaskKindError(f"Unknown task kind {kind!r}")
+        task_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                queued = conn.execute("SELECT COUNT(*) FROM tasks WHERE status = ?", (QUEUED,)).fetchone()[0]
+                if queued >= TASK_QUEUE_MAX:
+                    raise QueueFullError(f"Task queue full: {queued} tasks waiting")
+                conn.execute(
+                    "INSERT INTO tasks (id, kind, status, params, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (task_id, kind, QUEUED, json.dumps(params), time.time()),
+                )
+                conn.executemany(
+                    "INSERT INTO task_files (task_id, name, data) VALUES (?, ?, ?)",
+                    [(task_id, name, data) for name, data in (files or {}).items()],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return task_id
+
+    def claim(self):
+        """
+        Atomically mark the oldest queued task as running and return it.
+
+        The task is leased to the caller under a new token: updates made with
+        another token (from a worker whose lease expired and whose task was
+        requeued and claimed again) are ignored.
+
+        Returns:
+            dict: "id", "lease", "kind", "params" and "files", or None if nothing is queued
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, kind, params FROM tasks WHERE status = ? ORDER BY seq LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            lease = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE tasks SET status = ?, started_at = ?, heartbeat_at = ?, lease = ?, message = ? WHERE id = ?",
+                (RUNNING, now, now, lease, "started", row["id"]),
+            )
+            conn.execute("COMMIT")
+            files = {
+                file_row["name"]: file_row["data"]
+                for file_row in conn.execute("SELECT name, data FROM task_files WHERE task_id = ?", (row["id"],))
+            }
+        return {"id": row["id"], "lease": lease, "kind": row["kind"], "params": json.loads(row["params"]), "files": files}
+
+    def set_progress(self, task_id, lease, progress, message):
+        """
+        Report progress (renewing the lease). Returns False if the lease was lost.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE tasks SET progress = ?, message = ?, heartbeat_at = ? WHERE id = ? AND lease = ? AND status = ?",
+                (progress, message, time.time(), task_id, lease, RUNNING),
+            ).rowcount > 0
+
+    def heartbeat(self, task_id, lease):
+        """
+        Renew the lease of a running task. Returns False if the lease was lost.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE tasks SET heartbeat_at = ? WHERE id = ? AND lease = ? AND status = ?",
+                (time.time(), task_id, lease, RUNNING),
+            ).rowcount > 0
+
+    def finish(self, task_id, lease, result=None, error=None):
+        """
+        Store the result (or error) of a task and drop its input files.
+
+        Only the holder of the current lease can finish a task: a stale finish
+        (the task was requeued, and maybe claimed or finished by another worker)
+        is ignored.
+
+        Returns:
+            bool: Whether the result was stored
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            updated = conn.execute(
+                "UPDATE tasks SET status = ?, progress = ?, message = ?, result = ?, error = ?, finished_at = ?, lease = NULL "
+                "WHERE id = ? AND lease = ? AND status = ?",
+                (FAILED if error else DONE, 1.0, "failed" if error else "done",
+                 json.dumps(result) if error is None else None, error, time.time(), task_id, lease, RUNNING),
+            ).rowcount
+            if updated:
+                conn.execute("DELETE FROM task_files WHERE task_id = ?", (task_id,))
+            conn.execute("COMMIT")
+        if not updated:
+            logger.warning("Ignoring the result of task %s: its lease expired and it was requeued", task_id)
+        return bool(updated)
+
+    def get(self, task_id, with_result=False):
+        """
+        Return the status of a task (and its result if with_result), or None if unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            position = None
+            if row["status"] == QUEUED:
+                position = conn.execute(
+                    "SELECT COUNT(*) FROM tasks WHERE status = ? AND seq < ?", (QUEUED, row["seq"])
+                ).fetchone()[0]
+        task = {
+            "task_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "progress": round(row["progress"], 3),
+            "message": row["message"],
+            "queue_position": position,
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "error": row["error"],
+        }
+        if with_result:
+            task["result"] = json.loads(row["result"]) if row["result"] else None
+        return task
+
+    def recover(self, lease_seconds=None):
+        """
+        Requeue running tasks whose lease expired and delete expired finished tasks.
+
+        Workers renew the lease of their task every few seconds, so only tasks of a
+        worker that crashed or lost the database are requeued; this is safe to call
+        while other workers (in this or another process) are running.
+
+        Args:
+            lease_seconds (float, optional): Defaults to TASK_LEASE_SECONDS
+        """
+        lease_seconds = TASK_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            requeued = conn.execute(
+                "UPDATE tasks SET status = ?, progress = 0, message = 'requeued', lease = NULL "
+                "WHERE status = ? AND COALESCE(heartbeat_at, started_at, 0) < ?",
+                (QUEUED, RUNNING, time.time() - lease_seconds),
+            ).rowcount
+            expired = [row[0] for row in conn.execute(
+                "SELECT id FROM tasks WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, time.time() - TASK_RETENTION_SECONDS),
+            )]
+            conn.executemany("DELETE FROM task_files WHERE task_id = ?", [(task_id,) for task_id in expired])
+            conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in expired])
+            conn.execute("COMMIT")
+        if requeued:
+            logger.warning("Requeued %d interrupted tasks", requeued)
+        return requeued
+
+    def stats(self):
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)}
+
+
+_task_store = None
+
+
+def get_task_store():
+    """
+    Return the shared TaskStore for TASK_DB_PATH, creating it on first use.
+    """
+    global _task_store
+    if _task_store is None:
+        _task_store = TaskStore()
+    return _task_store
+
+
+def extract_pdf(pdf_bytes, backend=None):
+    """
+    Extract a PDF like the API does (same cache), but without the request time budget.
+    """
+    return extract_document_cached(pdf_bytes, backend=backend, time_budget=TASK_TIME_BUDGET)
+
+
+def run_extract_task(params, files, report_progress):
+    report_progress(0.1, "extracting")
+    document = extract_pdf(files["file"], params.get("pdf_backend"))
+    return document
+
+
+def run_match_task(params, files, report_progress):
+    backend = params.get("pdf_backend")
+    report_progress(0.1, "extracting resume")
+    resume = extract_pdf(files["file"], backend)
+    job_description_text = params.get("job_description")
+    job_description = None
+    if "jd_file" in files:
+        report_progress(0.4, "extracting job description")
+        job_description = extract_pdf(files["jd_file"], backend)
+        job_description_text = job_description["text"]
+    report_progress(0.7, "analyzing")
+    result = {
+        "resume_text": resume["text"],
+        "resume_ocr_pages": resume["ocr_pages"],
+        "job_description_text": job_description_text,
+        "analysis": comprehensive_resume_job_analysis(resume["text"], job_description_text),
+    }
+    if job_description is not None:
+        result["job_description_ocr_pages"] = job_description["ocr_pages"]
+    return result
+
+
+# Task kinds. Each handler takes (params, files, report_progress) and returns a
+# JSON-serializable result; report_progress(fraction, message) updates the status.
+TASK_HANDLERS = {
+    "extract": run_extract_task,
+    "match": run_match_task,
+}
+
+
+@contextmanager
+def keep_lease(store, task_id, lease):
+    """
+    Renew the lease of task_id from a background thread while the block runs.
+    """
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(TASK_LEASE_SECONDS / 4):
+            try:
+                if not store.heartbeat(task_id, lease):
+                    logger.warning("Lost the lease of task %s", task_id)
+                    return
+            except sqlite3.Error as e:
+                logger.warning("Could not renew the lease of task %s: %s", task_id, e)
+
+    thread = threading.Thread(target=renew, name=f"lease-{task_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_next_task(store):
+    """
+    Claim and run one queued task. Returns False if the queue was empty.
+    """
+    task = store.claim()
+    if task is None:
+        return False
+    task_id, lease = task["id"], task["lease"]
+    logger.info("Running %s task %s", task["kind"], task_id)
+    try:
+        validate_backend(task["params"].get("pdf_backend"))
+        report_progress = lambda progress, message: store.set_progress(task_id, lease, progress, message)
+        with keep_lease(store, task_id, lease):
+            result = TASK_HANDLERS[task["kind"]](task["params"], task["files"], report_progress)
+    except Exception as e:
+        logger.exception("Task %s failed", task_id)
+        store.finish(task_id, lease, error=f"{type(e).__name__}: {e}")
+    else:
+        store.finish(task_id, lease, result=result)
+    return True
+
+
+def worker_main(db_path=None, stop_event=None):
+    """
+    Run tasks until stop_event is set (or forever).
+    """
+    configure_logging()
+    # The API process handles Ctrl+C and stops its workers through stop_event
+    if stop_event is not None:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    store = TaskStore(db_path)
+    last_recovery = None
+    while stop_event is None or not stop_event.is_set():
+        # Pick up tasks abandoned by crashed workers, at most once per lease period
+        if last_recovery is None or time.monotonic() - last_recovery > TASK_LEASE_SECONDS:
+            store.recover()
+            last_recovery = time.monotonic()
+        if not run_next_task(store):
+            if stop_event is not None:
+                stop_event.wait(TASK_POLL_INTERVAL)
+            else:
+                time.sleep(TASK_POLL_INTERVAL)
+
+
+_workers = []
+_stop_event = None
+
+
+def start_task_workers(store, count=None):
+    """
+    Start count worker processes (defaults to TASK_WORKERS). Each worker requeues
+    tasks whose lease expired (see TaskStore.recover) as it starts and then once per
+    lease period.
+
+    Workers are spawned rather than forked: the API process already runs threads
+    (worker pool management), and forking a threaded process is unsafe.
+    """
+    global _stop_event
+    count = TASK_WORKERS if count is None else count
+    if count <= 0 or _workers:
+        return
+    context = multiprocessing.get_context("spawn")
+    _stop_event = context.Event()
+    for _ in range(count):
+        process = context.Process(target=worker_main, args=(store.path, _stop_event), daemon=True)
+        process.start()
+        _workers.append(process)
+
+
+def stop_task_workers(timeout=30):
+    """
+    Let workers finish their current task and stop them.
+    """
+    if _stop_event is not None:
+        _stop_event.set()
+    for process in _workers:
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+    _workers.clear()
+
+
+def task_worker_stats():
+    return {"workers": len(_workers), "alive": sum(process.is_alive() for process in _workers)}
+
+
+if __name__ == "__main__":
+    worker_main()
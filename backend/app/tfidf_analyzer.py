@@ -1,206 +1,552 @@
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import time
+import logging
+import numpy as np
+try:
+    from backend.utils.text_normalizer import normalize_for_tfidf, normalize_for_tfidf_batch
+    from backend.utils.log_utils import trace, debug_enabled
+    from backend.utils import metrics
+except ImportError:
+    from text_normalizer import normalize_for_tfidf, normalize_for_tfidf_batch
+    from log_utils import trace, debug_enabled
+    import metrics
 
+logger = logging.getLogger(__name__)
+
+# Corpus-fitted vectorizer written by tfidf_model.py. When present, the analyzers
+# only call transform() instead of fitting a new vectorizer on every request.
+TFIDF_MODEL_PATH = os.getenv(
+    "TFIDF_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "tfidf_model.joblib")
+)
+# Document-frequency table of a feature-hashing model (tfidf_model.py --hashing).
+# Defaults to <model file>_df.npz next to the model.
+TFIDF_DF_PATH = os.getenv("TFIDF_DF_PATH")
+
+# Settings shared by the per-request vectorizers and the corpus-fitted model
+VECTORIZER_PARAMS = {
+    "ngram_range": (1, 2),
+    "min_df": 1,
+    "max_df": 1.0,
+    "stop_words": None,
+    "token_pattern": r'\b[a-zA-Z][a-zA-Z0-9]*\b',
+}
+
+# Vocabulary caps of the per-request vectorizers: one document's keywords, and a
+# resume/job description pair. Keyword and similarity analysis only touch the
+# nonzero terms, so these can be raised to tens of thousands.
+KEYWORD_MAX_FEATURES = int(os.getenv("KEYWORD_MAX_FEATURES", "50"))
+SIMILARITY_MAX_FEATURES = int(os.getenv("SIMILARITY_MAX_FEATURES", "100"))
+
+_tfidf_model = None
+_tfidf_model_checked = False
+
+def load_tfidf_model(path=None):
+    """
+    Load a corpus-fitted TF-IDF model saved by tfidf_model.py.
+
+    Args:
+        path (str, optional): Model file, defaults to TFIDF_MODEL_PATH
+
+    Returns:
+        dict: The model ("vectorizer", "version", ...) or None if there is no model file
+    """
+    global _tfidf_model, _tfidf_model_checked
+    path = path or TFIDF_MODEL_PATH
+    _tfidf_model_checked = True
+    if not os.path.exists(path):
+        logger.info("No TF-IDF model at %s, fitting per request", path)
+        _tfidf_model = None
+        return None
+    import joblib
+    model = joblib.load(path)
+    if model.get("kind") == "hashing":
+        from hashing_features import DocumentFrequencyTable, HashingTfidfVectorizer
+        df_path = df_table_path(path)
+        table = DocumentFrequencyTable.load(df_path, model["params"])
+        model["vectorizer"] = HashingTfidfVectorizer(table)
+        # IDF weights depend on the table, so results are versioned by it too
+        model["version"] = f"{model['version']}-df{table.version}"
+        model["feature_names"] = None
+        logger.info("Loaded hashing TF-IDF model %s (%d columns, DF table of %d documents from %s)",
+                    model['version'], table.n_features, table.n_documents, df_path)
+    else:
+        model["feature_names"] = model["vectorizer"].get_feature_names_out()
+        logger.info("Loaded TF-IDF model %s (%d features)", model['version'], len(model['feature_names']))
+    _tfidf_model = model
+    return _tfidf_model
+
+def df_table_path(model_path=None):
+    """
+    Return where the document-frequency table of a hashing model lives.
+    """
+    if TFIDF_DF_PATH:
+        return TFIDF_DF_PATH
+    return f"{os.path.splitext(model_path or TFIDF_MODEL_PATH)[0]}_df.npz"
+
+def model_feature_names(model, processed_texts):
+    """
+    Return the feature names for columns of model.transform(processed_texts).
+
+    A hashing model has no vocabulary; its names are rebuilt from the terms of
+    processed_texts, which covers every column those documents use.
+    """
+    if model["feature_names"] is None:
+        return model["vectorizer"].feature_names(processed_texts)
+    return model["feature_names"]
+
+def get_tfidf_model():
+    """
+    Return the loaded TF-IDF model, loading it from TFIDF_MODEL_PATH on first use.
+    """
+    if not _tfidf_model_checked:
+        load_tfidf_model()
+    return _tfidf_model
+
+def model_version():
+    """
+    Return the version stamp of the loaded model, or "per-request" without one.
+    """
+    model = get_tfidf_model()
+    return model["version"] if model else "per-request"
+
+@metrics.timed("vectorize")
+def vectorize_texts(processed_texts, max_features):
+    """
+    Turn preprocessed texts into a TF-IDF matrix.
+
+    Uses the corpus-fitted model when one is loaded; otherwise fits a vectorizer
+    on the given texts alone (the original per-request behaviour).
+
+    Returns:
+        tuple: (sparse TF-IDF matrix, feature names)
+    """
+    model = get_tfidf_model()
+    if model is not None:
+        return model["vectorizer"].transform(processed_texts), model_feature_names(model, processed_texts)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(max_features=max_features, **VECTORIZER_PARAMS)
+    tfidf_matrix = vectorizer.fit_transform(processed_texts)
+    return tfidf_matrix, vectorizer.get_feature_names_out()
+
+@metrics.timed("normalize")
 def preprocess_text(text):
-    """Minimal preprocessing to preserve meaningful terms"""
-    if not text or not isinstance(text, str):
-        return ""
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    # Remove special characters but keep letters, numbers, spaces, and hyphens
-    text = re.sub(r'[^a-zA-Z0-9\s\-]', ' ', text)
-    
-    # Remove standalone years (2020, 2021, etc.)
-    text = re.sub(r'\b(19|20)\d{2}\b', '', text)
-    
-    # Remove very short words (less than 2 chars) and very long words (more than 20 chars)
-    words = text.split()
-    words = [word for word in words if 2 <= len(word) <= 20]
-    
-    # Minimal stopword removal - only remove very common words
-    minimal_stopwords = {
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
-        'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after', 'above',
-        'below', 'between', 'among', 'this', 'that', 'these', 'those', 'is', 'was', 'are',
-        'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-        'would', 'could', 'should', 'may', 'might', 'must', 'can', 'shall'
-    }
-    
-    # Keep technical and meaningful terms
-    filtered_words = [word for word in words if word not in minimal_stopwords]
-    
-    result = ' '.join(filtered_words)
-    print(f"DEBUG - Preprocessed text preview: {result[:200]}...")  # Debug output
+    """Minimal preprocessing to preserve meaningful terms (see text_normalizer.normalize_for_tfidf)"""
+    result = normalize_for_tfidf(text)
+    if debug_enabled(logger):
+        trace(logger, "Preprocessed text preview: %s...", result[:200])
     return result
 
+def top_k_positions(scores, k):
+    """
+    Return the positions of the k largest scores, largest first.
+
+    Ties keep their order in scores, like a stable sort would. Only the
+    candidates found by argpartition are sorted, so this is O(len(scores)) for
+    small k.
+    """
+    if len(scores) > k > 0:
+        threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+
+def _sparse_row(tfidf_matrix, row):
+    """
+    Return (column indices in ascending order, values) of the nonzeros of one row.
+    """
+    tfidf_matrix = tfidf_matrix.tocsr()
+    start, end = tfidf_matrix.indptr[row], tfidf_matrix.indptr[row + 1]
+    indices, values = tfidf_matrix.indices[start:end], tfidf_matrix.data[start:end]
+    if not tfidf_matrix.has_sorted_indices:
+        order = np.argsort(indices, kind="stable")
+        indices, values = indices[order], values[order]
+    nonzero = values != 0
+    return indices[nonzero], values[nonzero]
+
+@metrics.timed("keywords")
+def keyword_analysis(tfidf_matrix, feature_names, top_n=15):
+    """
+    Build the top-keyword analysis from a single-row TF-IDF matrix.
+
+    Works on the row's nonzero entries only, so the cost does not depend on the
+    vocabulary size.
+    """
+    indices, scores = _sparse_row(tfidf_matrix, 0)
+    top = top_k_positions(scores, top_n)
+    return {
+        "top_keywords": [
+            {"term": feature_names[indices[t]], "score": round(scores[t], 4)} for t in top if scores[t] > 0
+        ]
+    }
+
 def analyze_resume_with_tfidf(resume_text):
     try:
-        print(f"DEBUG - Original resume text length: {len(resume_text)}")
+        trace(logger, "Original resume text length: %d", len(resume_text))
         processed_text = preprocess_text(resume_text)
-        print(f"DEBUG - Processed resume text length: {len(processed_text)}")
+        trace(logger, "Processed resume text length: %d", len(processed_text))
         
         if not processed_text.strip():
             return {"error": "No valid text extracted for TF-IDF analysis"}
 
-        vectorizer = TfidfVectorizer(
-            max_features=50,
-            ngram_range=(1, 2),
-            min_df=1,
-            max_df=1.0,  # Changed from 0.9 to 1.0 for single documents
-            stop_words=None,
-            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9]*\b'
-        )
+        tfidf_matrix, feature_names = vectorize_texts([processed_text], max_features=KEYWORD_MAX_FEATURES)
         
-        tfidf_matrix = vectorizer.fit_transform([processed_text])
-        feature_names = vectorizer.get_feature_names_out()
-        tfidf_scores = tfidf_matrix.toarray()[0]
+        trace(logger, "Resume features found: %d", len(feature_names))
+        if debug_enabled(logger):
+            trace(logger, "Top resume features: %s", feature_names[:10])
         
-        print(f"DEBUG - Resume features found: {len(feature_names)}")
-        print(f"DEBUG - Top resume features: {feature_names[:10]}")
-        
-        keyword_scores = {feature_names[i]: tfidf_scores[i] for i in range(len(feature_names))}
-        top_keywords = sorted(keyword_scores.items(), key=lambda x: x[1], reverse=True)[:15]
-        
-        return {
-            "top_keywords": [{"term": term, "score": round(score, 4)} for term, score in top_keywords if score > 0]
-        }
+        return keyword_analysis(tfidf_matrix, feature_names)
     except Exception as e:
-        print(f"DEBUG - Resume analysis error: {str(e)}")
+        logger.warning("Resume analysis error: %s", e)
         return {"error": f"TF-IDF analysis failed: {str(e)}"}
 
 def analyze_job_description_with_tfidf(job_description_text):
     try:
-        print(f"DEBUG - Original job desc text length: {len(job_description_text)}")
+        trace(logger, "Original job desc text length: %d", len(job_description_text))
         processed_text = preprocess_text(job_description_text)
-        print(f"DEBUG - Processed job desc text length: {len(processed_text)}")
+        trace(logger, "Processed job desc text length: %d", len(processed_text))
         
         if not processed_text.strip():
             return {"error": "No valid text extracted for TF-IDF analysis"}
 
-        vectorizer = TfidfVectorizer(
-            max_features=50,
-            ngram_range=(1, 2),
-            min_df=1,
-            max_df=1.0,  # Changed from 0.9 to 1.0 for single documents
-            stop_words=None,
-            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9]*\b'
-        )
-        
-        tfidf_matrix = vectorizer.fit_transform([processed_text])
-        feature_names = vectorizer.get_feature_names_out()
-        tfidf_scores = tfidf_matrix.toarray()[0]
-        
-        print(f"DEBUG - Job desc features found: {len(feature_names)}")
-        print(f"DEBUG - Top job desc features: {feature_names[:10]}")
+        tfidf_matrix, feature_names = vectorize_texts([processed_text], max_features=KEYWORD_MAX_FEATURES)
         
-        keyword_scores = {feature_names[i]: tfidf_scores[i] for i in range(len(feature_names))}
-        top_keywords = sorted(keyword_scores.items(), key=lambda x: x[1], reverse=True)[:15]
+        trace(logger, "Job desc features found: %d", len(feature_names))
+        if debug_enabled(logger):
+            trace(logger, "Top job desc features: %s", feature_names[:10])
         
-        return {
-            "top_keywords": [{"term": term, "score": round(score, 4)} for term, score in top_keywords if score > 0]
-        }
+        return keyword_analysis(tfidf_matrix, feature_names)
     except Exception as e:
-        print(f"DEBUG - Job desc analysis error: {str(e)}")
+        logger.warning("Job desc analysis error: %s", e)
         return {"error": f"TF-IDF analysis failed: {str(e)}"}
 
+def match_quality_label(similarity_score):
+    """
+    Map a cosine similarity score to a human-readable match quality.
+    """
+    if similarity_score >= 0.3:
+        return "Excellent Match"
+    elif similarity_score >= 0.2:
+        return "Good Match"
+    elif similarity_score >= 0.1:
+        return "Fair Match"
+    return "Poor Match"
+
+@metrics.timed("similarity")
+def similarity_analysis(tfidf_matrix, feature_names, top_n=15):
+    """
+    Build the similarity analysis from a two-row (resume, job description) TF-IDF matrix.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    # Calculate cosine similarity
+    similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
+    similarity_score = similarity_matrix[0][0]
+    
+    trace(logger, "Raw similarity score: %s", similarity_score)
+    
+    # Find common terms: intersect the nonzero columns of both rows
+    resume_indices, resume_values = _sparse_row(tfidf_matrix, 0)
+    job_indices, job_values = _sparse_row(tfidf_matrix, 1)
+    common, in_resume, in_job = np.intersect1d(resume_indices, job_indices, assume_unique=True, return_indices=True)
+    resume_scores, job_desc_scores = resume_values[in_resume], job_values[in_job]
+    shared = (resume_scores > 0) & (job_desc_scores > 0)
+    common, resume_scores, job_desc_scores = common[shared], resume_scores[shared], job_desc_scores[shared]
+    
+    trace(logger, "Common terms found: %d", len(common))
+    if debug_enabled(logger):
+        for i, resume_score, job_score in zip(common, resume_scores, job_desc_scores):
+            trace(logger, "Common term found: %s (resume: %.4f, job: %.4f)", feature_names[i], resume_score, job_score)
+    
+    # Ranked by the rounded importance that is reported, ties in column order
+    combined_importance = np.round((resume_scores + job_desc_scores) / 2, 4)
+    common_terms = [
+        {
+            "term": feature_names[common[t]],
+            "resume_score": round(resume_scores[t], 4),
+            "job_desc_score": round(job_desc_scores[t], 4),
+            "combined_importance": combined_importance[t]
+        }
+        for t in top_k_positions(combined_importance, top_n)
+    ]
+    
+    return {
+        "similarity_score": round(similarity_score, 4),
+        "match_quality": match_quality_label(similarity_score),
+        "common_keywords": common_terms,
+        "total_features": len(feature_names)
+    }
+
 def calculate_resume_job_similarity(resume_text, job_description_text):
     try:
-        print("DEBUG - Starting similarity calculation...")
+        trace(logger, "Starting similarity calculation...")
         processed_resume = preprocess_text(resume_text)
         processed_job_desc = preprocess_text(job_description_text)
         
-        print(f"DEBUG - Processed resume length: {len(processed_resume)}")
-        print(f"DEBUG - Processed job desc length: {len(processed_job_desc)}")
+        trace(logger, "Processed resume length: %d", len(processed_resume))
+        trace(logger, "Processed job desc length: %d", len(processed_job_desc))
         
         if not processed_resume.strip() or not processed_job_desc.strip():
             return {"error": "One or both texts are empty after preprocessing"}
 
-        vectorizer = TfidfVectorizer(
-            max_features=100,
-            ngram_range=(1, 2),
-            min_df=1,
-            max_df=1.0,  # Changed from 0.9 to 1.0 for two documents
-            stop_words=None,
-            token_pattern=r'\b[a-zA-Z][a-zA-Z0-9]*\b'
-        )
-        
         # Combine texts for vectorization
         combined_texts = [processed_resume, processed_job_desc]
-        tfidf_matrix = vectorizer.fit_transform(combined_texts)
-        
-        feature_names = vectorizer.get_feature_names_out()
-        print(f"DEBUG - Total features in similarity: {len(feature_names)}")
-        print(f"DEBUG - Sample features: {feature_names[:10]}")
-        
-        # Calculate cosine similarity
-        similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-        similarity_score = similarity_matrix[0][0]
-        
-        print(f"DEBUG - Raw similarity score: {similarity_score}")
+        tfidf_matrix, feature_names = vectorize_texts(combined_texts, max_features=SIMILARITY_MAX_FEATURES)
         
-        # Get feature analysis
-        resume_scores = tfidf_matrix[0].toarray()[0]
-        job_desc_scores = tfidf_matrix[1].toarray()[0]
+        trace(logger, "Total features in similarity: %d", len(feature_names))
+        if debug_enabled(logger):
+            trace(logger, "Sample features: %s", feature_names[:10])
         
-        # Find common terms with detailed debugging
-        common_terms = []
-        for i, feature in enumerate(feature_names):
-            if resume_scores[i] > 0 and job_desc_scores[i] > 0:
-                common_terms.append({
-                    "term": feature,
-                    "resume_score": round(resume_scores[i], 4),
-                    "job_desc_score": round(job_desc_scores[i], 4),
-                    "combined_importance": round((resume_scores[i] + job_desc_scores[i]) / 2, 4)
-                })
-                print(f"DEBUG - Common term found: {feature} (resume: {resume_scores[i]:.4f}, job: {job_desc_scores[i]:.4f})")
-        
-        print(f"DEBUG - Common terms found: {len(common_terms)}")
-        
-        common_terms = sorted(common_terms, key=lambda x: x["combined_importance"], reverse=True)[:15]
-        
-        # Match quality
-        if similarity_score >= 0.3:
-            match_quality = "Excellent Match"
-        elif similarity_score >= 0.2:
-            match_quality = "Good Match"
-        elif similarity_score >= 0.1:
-            match_quality = "Fair Match"
-        else:
-            match_quality = "Poor Match"
-        
-        return {
-            "similarity_score": round(similarity_score, 4),
-            "match_quality": match_quality,
-            "common_keywords": common_terms,
-            "total_features": len(feature_names)
-        }
+        return similarity_analysis(tfidf_matrix, feature_names)
         
     except Exception as e:
-        print(f"DEBUG - Similarity calculation error: {str(e)}")
+        logger.warning("Similarity calculation error: %s", e)
         return {"error": f"Similarity calculation failed: {str(e)}"}
 
-def comprehensive_resume_job_analysis(resume_text, job_description_text):
+# scikit-learn's error for documents without a single token
+EMPTY_VOCABULARY_ERROR = "empty vocabulary; perhaps the documents only contain stop words"
+
+@metrics.timed("vectorize")
+def document_term_counts(processed_texts):
+    """
+    Tokenize preprocessed texts once into a shared document-term count matrix.
+
+    Returns:
+        tuple: (float64 CSR count matrix, sorted feature names), or (None, None)
+        if the texts contain no tokens at all
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+    vectorizer = CountVectorizer(dtype=np.float64, **VECTORIZER_PARAMS)
     try:
-        print("DEBUG - Starting comprehensive analysis...")
-        resume_analysis = analyze_resume_with_tfidf(resume_text)
-        job_desc_analysis = analyze_job_description_with_tfidf(job_description_text)
-        similarity_analysis = calculate_resume_job_similarity(resume_text, job_description_text)
+        counts = vectorizer.fit_transform(processed_texts).tocsr()
+    except ValueError:
+        return None, None
+    return counts, vectorizer.get_feature_names_out()
+
+@metrics.timed("vectorize")
+def tfidf_from_counts(counts, feature_names, max_features):
+    """
+    Derive what TfidfVectorizer(max_features=...).fit_transform would return for the
+    documents in counts, without re-tokenizing them.
+
+    Only the columns used by these documents are considered, and the max_features
+    cut keeps the same columns (same tie-breaking) as scikit-learn.
+
+    Args:
+        counts (scipy.sparse.csr_matrix): Rows of a document_term_counts matrix
+        feature_names (numpy.ndarray): Feature names of the count matrix
+        max_features (int): Vocabulary cap of the vectorizer being reproduced
+
+    Returns:
+        tuple: (sparse TF-IDF matrix, feature names)
+    """
+    if counts is None:
+        raise ValueError(EMPTY_VOCABULARY_ERROR)
+    columns = np.unique(counts.indices)
+    if len(columns) == 0:
+        raise ValueError(EMPTY_VOCABULARY_ERROR)
+    if len(columns) > max_features:
+        term_frequencies = np.asarray(counts[:, columns].sum(axis=0)).ravel()
+        columns = np.sort(columns[(-term_frequencies).argsort()[:max_features]])
+    from sklearn.feature_extraction.text import TfidfTransformer
+    tfidf_matrix = TfidfTransformer().fit_transform(counts[:, columns])
+    return tfidf_matrix, feature_names[columns]
+
+def prepare_document(text):
+    """
+    Precompute the per-document part of comprehensive_resume_job_analysis, so a
+    registered document is not preprocessed and vectorized again on every match.
+
+    Returns:
+        dict: "text", "processed_text", "model_version", "vector" (1-row TF-IDF
+        matrix under the corpus-fitted model, None without one) and "keywords"
+        (the keyword analysis comprehensive_resume_job_analysis reports for it)
+    """
+    processed_text = preprocess_text(text)
+    model = get_tfidf_model()
+    vector = None
+    if model is not None:
+        with metrics.stage("vectorize"):
+            vector = model["vectorizer"].transform([processed_text]).tocsr()
+    if not processed_text.strip():
+        keywords = {"error": "No valid text extracted for TF-IDF analysis"}
+    else:
+        try:
+            if vector is not None:
+                keywords = keyword_analysis(vector, model_feature_names(model, [processed_text]))
+            else:
+                keywords = keyword_analysis(*tfidf_from_counts(*document_term_counts([processed_text]), KEYWORD_MAX_FEATURES))
+        except Exception as e:
+            keywords = {"error": f"TF-IDF analysis failed: {str(e)}"}
+    return {
+        "text": text,
+        "processed_text": processed_text,
+        "model_version": model_version(),
+        "vector": vector,
+        "keywords": keywords,
+    }
+
+def _current_preparation(text, prepared):
+    """
+    Return (preprocessed text, prepared document or None if it is missing or was
+    prepared under another model) for one side of comprehensive_resume_job_analysis.
+    """
+    if prepared is None:
+        return preprocess_text(text), None
+    if prepared["model_version"] != model_version():
+        return prepared["processed_text"], None
+    return prepared["processed_text"], prepared
+
+def comprehensive_resume_job_analysis(resume_text=None, job_description_text=None, job_description=None, resume=None):
+    """
+    Keyword analysis of both documents plus their similarity, in a single pass.
+
+    Each document is preprocessed once and tokenized once into a shared
+    document-term matrix; the per-document keywords and the pairwise similarity
+    are all derived from it. Results are the same as calling
+    analyze_resume_with_tfidf, analyze_job_description_with_tfidf and
+    calculate_resume_job_similarity separately.
+
+    Args:
+        resume_text (str, optional): Raw resume text
+        job_description_text (str, optional): Raw job description text
+        job_description (dict, optional): The job description from prepare_document
+            instead of its text; its precomputed parts are reused when they were
+            computed under the current model
+        resume (dict, optional): The resume from prepare_document instead of its text
+    """
+    try:
+        trace(logger, "Starting comprehensive analysis...")
+        processed_resume, resume = _current_preparation(resume_text, resume)
+        processed_job_desc, job_description = _current_preparation(job_description_text, job_description)
+
+        model = get_tfidf_model()
+        if model is not None:
+            with metrics.stage("vectorize"):
+                if resume is None and job_description is None:
+                    tfidf_matrix = model["vectorizer"].transform([processed_resume, processed_job_desc])
+                else:
+                    import scipy.sparse as sp
+                    tfidf_matrix = sp.vstack([
+                        prepared["vector"] if prepared is not None else model["vectorizer"].transform([processed])
+                        for processed, prepared in ((processed_resume, resume), (processed_job_desc, job_description))
+                    ], format="csr")
+            feature_names = model_feature_names(model, [processed_resume, processed_job_desc])
+            resume_tfidf = lambda: (tfidf_matrix[0:1], feature_names)
+            job_desc_tfidf = lambda: (tfidf_matrix[1:2], feature_names)
+            pair_tfidf = lambda: (tfidf_matrix, feature_names)
+        else:
+            counts, feature_names = document_term_counts([processed_resume, processed_job_desc])
+            resume_tfidf = lambda: tfidf_from_counts(counts[0:1] if counts is not None else None, feature_names, KEYWORD_MAX_FEATURES)
+            job_desc_tfidf = lambda: tfidf_from_counts(counts[1:2] if counts is not None else None, feature_names, KEYWORD_MAX_FEATURES)
+            pair_tfidf = lambda: tfidf_from_counts(counts, feature_names, SIMILARITY_MAX_FEATURES)
+
+        if resume is not None:
+            resume_analysis = resume["keywords"]
+        elif processed_resume.strip():
+            try:
+                resume_analysis = keyword_analysis(*resume_tfidf())
+            except Exception as e:
+                resume_analysis = {"error": f"TF-IDF analysis failed: {str(e)}"}
+        else:
+            resume_analysis = {"error": "No valid text extracted for TF-IDF analysis"}
+
+        if job_description is not None:
+            job_desc_analysis = job_description["keywords"]
+        elif processed_job_desc.strip():
+            try:
+                job_desc_analysis = keyword_analysis(*job_desc_tfidf())
+            except Exception as e:
+                job_desc_analysis = {"error": f"TF-IDF analysis failed: {str(e)}"}
+        else:
+            job_desc_analysis = {"error": "No valid text extracted for TF-IDF analysis"}
+
+        if processed_resume.strip() and processed_job_desc.strip():
+            try:
+                pair_analysis = similarity_analysis(*pair_tfidf())
+            except Exception as e:
+                pair_analysis = {"error": f"Similarity calculation failed: {str(e)}"}
+        else:
+            pair_analysis = {"error": "One or both texts are empty after preprocessing"}
         
         return {
             "resume_analysis": resume_analysis,
             "job_description_analysis": job_desc_analysis,
-            "similarity_analysis": similarity_analysis
+            "similarity_analysis": pair_analysis
         }
         
     except Exception as e:
-        print(f"DEBUG - Comprehensive analysis error: {str(e)}")
+        logger.warning("Comprehensive analysis error: %s", e)
         return {"error": f"Comprehensive analysis failed: {str(e)}"}
+
+# Vocabulary cap when a batch has to be vectorized without the corpus-fitted model
+BATCH_MAX_FEATURES = 5000
+
+def batch_resume_job_similarity(resume_texts, job_description_texts, top_terms=5):
+    """
+    Score N resumes against M job descriptions in one pass.
+
+    All documents are preprocessed once and vectorized together (with the
+    corpus-fitted model when loaded, otherwise one vectorizer fitted on the whole
+    batch), and the full N x M cosine similarity matrix comes from a single
+    sparse matrix product.
+
+    Args:
+        resume_texts (list): Raw resume texts
+        job_description_texts (list): Raw job description texts
+        top_terms (int): Number of common keywords reported per pair
+
+    Returns:
+        dict: "scores" (N x M list of lists), "common_keywords" (N x M lists of terms,
+        most important first) and "total_features"
+    """
+    try:
+        trace(logger, "Starting batch similarity: %d resumes x %d job descriptions", len(resume_texts), len(job_description_texts))
+        with metrics.stage("normalize"):
+            processed = normalize_for_tfidf_batch(list(resume_texts) + list(job_description_texts))
+        if not any(text.strip() for text in processed):
+            return {"error": "All texts are empty after preprocessing"}
+
+        tfidf_matrix, feature_names = vectorize_texts(processed, max_features=BATCH_MAX_FEATURES)
+        tfidf_matrix = tfidf_matrix.tocsr()
+        resume_matrix = tfidf_matrix[:len(resume_texts)]
+        job_matrix = tfidf_matrix[len(resume_texts):]
+
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        with metrics.stage("similarity"):
+            scores = (resume_matrix @ job_matrix.T).toarray()
+
+        keywords_start = time.perf_counter()
+        common_keywords = [[None] * job_matrix.shape[0] for _ in range(resume_matrix.shape[0])]
+        # Canonical rows (sorted, no duplicate terms), so a JD's score of a term can be
+        # looked up in its sparse row instead of densifying it (2^20 columns when hashing)
+        job_matrix.sum_duplicates()
+        for j in range(job_matrix.shape[0]):
+            job_row = job_matrix[j]
+            job_terms, job_values = job_row.indices, job_row.data
+            # Resume scores restricted to the terms this job description contains:
+            # each row's nonzeros are exactly the terms shared with the JD
+            shared = resume_matrix.multiply(job_row != 0).tocsr()
+            shared.eliminate_zeros()
+            shared.sort_indices()
+            for i in range(resume_matrix.shape[0]):
+                start, end = shared.indptr[i], shared.indptr[i + 1]
+                term_indices = shared.indices[start:end]
+                if len(term_indices) == 0:
+                    common_keywords[i][j] = []
+                    continue
+                # Ranked like similarity_analysis: by the rounded importance, ties in column order
+                combined = np.round((shared.data[start:end] + job_values[np.searchsorted(job_terms, term_indices)]) / 2, 4)
+                common_keywords[i][j] = [str(feature_names[term_indices[t]]) for t in top_k_positions(combined, top_terms)]
+        metrics.observe_stage("keywords", time.perf_counter() - keywords_start)
+
+        return {
+            "scores": np.round(scores, 4).tolist(),
+            "common_keywords": common_keywords,
+            "total_features": len(feature_names)
+        }
+
+    except Exception as e:
+        logger.warning("Batch similarity error: %s", e)
+        return {"error": f"Batch similarity failed: {str(e)}"}
@@ -0,0 +1,177 @@
+"""
+Offline fitting of the corpus-wide TF-IDF model used by tfidf_analyzer.
+
+Usage:
+    python backend/app/tfidf_model.py --corpus path/to/corpus [--output model.joblib]
+    python backend/app/tfidf_model.py --corpus path/to/corpus --hashing [--n-features 1048576]
+    python backend/app/tfidf_model.py --corpus more/documents --update-df
+
+The corpus directory is searched recursively for .txt and .pdf files (job
+descriptions and resumes). The fitted vectorizer is saved together with a
+version stamp; the API loads it once at startup and only calls transform().
+
+With --hashing no vocabulary is fitted: terms are hashed into --n-features
+columns (see hashing_features.py) and only a document-frequency table of that
+size is built for IDF, saved next to the model (TFIDF_DF_PATH). --update-df
+counts more documents into that table without touching anything else; restart
+the API to pick up the new IDF weights.
+"""
+import os
+import sys
+import time
+import hashlib
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from sklearn.feature_extraction.text import TfidfVectorizer
+from tfidf_analyzer import preprocess_text, VECTORIZER_PARAMS, TFIDF_MODEL_PATH, df_table_path
+from hashing_features import DocumentFrequencyTable, DEFAULT_N_FEATURES
+
+# Vocabulary cap for the corpus model (the per-request vectorizers use 50/100)
+DEFAULT_MAX_FEATURES = 20000
+
+
+def read_corpus(corpus_dir):
+    """
+    Read every .txt and .pdf document under corpus_dir.
+
+    Returns:
+        list: Raw document texts
+    """
+    documents = []
+    for root, _, files in os.walk(corpus_dir):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name.lower().endswith(".txt"):
+                with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                    documents.append(f.read())
+            elif name.lower().endswith(".pdf"):
+                from backend.utils.pdf_parser import textextractionfunction
+                documents.append(textextractionfunction(path))
+    return documents
+
+
+def fit_tfidf_model(documents, max_features=DEFAULT_MAX_FEATURES, min_df=1, max_df=1.0):
+    """
+    Fit a TF-IDF vectorizer on a corpus of raw documents.
+
+    Args:
+        documents (list): Raw resume and job description texts
+        max_features (int): Vocabulary size cap
+        min_df, max_df: Document-frequency limits passed to TfidfVectorizer
+
+    Returns:
+        dict: "vectorizer", "version", "created_at", "documents" and "params"
+    """
+    processed = [text for text in (preprocess_text(doc) for doc in documents) if text.strip()]
+    if not processed:
+        raise ValueError("Corpus contains no usable text")
+    params = dict(VECTORIZER_PARAMS, max_features=max_features, min_df=min_df, max_df=max_df)
+    vectorizer = TfidfVectorizer(**params)
+    vectorizer.fit(processed)
+
+    vocabulary_hash = hashlib.sha256("\n".join(vectorizer.get_feature_names_out()).encode()).hexdigest()[:12]
+    created_at = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    return {
+        "vectorizer": vectorizer,
+        "version": f"{created_at}-{vocabulary_hash}",
+        "created_at": created_at,
+        "documents": len(processed),
+        "params": params,
+    }
+
+
+def fit_hashing_model(documents, n_features=DEFAULT_N_FEATURES):
+    """
+    Build a feature-hashing model: settings plus a document-frequency table.
+
+    Args:
+        documents (list): Raw resume and job description texts
+        n_features (int): Number of hashed columns
+
+    Returns:
+        tuple: (model dict with "kind", "version", "created_at", "documents",
+        "params" and "n_features", DocumentFrequencyTable)
+    """
+    processed = [text for text in (preprocess_text(doc) for doc in documents) if text.strip()]
+    if not processed:
+        raise ValueError("Corpus contains no usable text")
+    params = dict(VECTORIZER_PARAMS)
+    table = DocumentFrequencyTable(n_features, params)
+    table.update(processed)
+    created_at = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    model = {
+        "kind": "hashing",
+        "version": f"{created_at}-hashing{n_features}",
+        "created_at": created_at,
+        "documents": len(processed),
+        "params": params,
+        "n_features": n_features,
+    }
+    return model, table
+
+
+def update_document_frequencies(documents, model_path=None):
+    """
+    Count more documents into the document-frequency table of a hashing model.
+
+    Returns:
+        DocumentFrequencyTable: The updated (and saved) table
+    """
+    import joblib
+    model_path = model_path or TFIDF_MODEL_PATH
+    model = joblib.load(model_path)
+    if model.get("kind") != "hashing":
+        raise ValueError(f"{model_path} is not a hashing model; refit it instead")
+    path = df_table_path(model_path)
+    table = DocumentFrequencyTable.load(path, model["params"])
+    table.update([text for text in (preprocess_text(doc) for doc in documents) if text.strip()])
+    table.save(path)
+    return table
+
+
+def save_tfidf_model(model, path=None):
+    """
+    Save a fitted model to path (defaults to TFIDF_MODEL_PATH).
+    """
+    import joblib
+    path = path or TFIDF_MODEL_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the corpus TF-IDF model")
+    parser.add_argument("--corpus", required=True, help="Directory of .txt/.pdf resumes and job descriptions")
+    parser.add_argument("--output", default=TFIDF_MODEL_PATH, help="Where to save the model")
+    parser.add_argument("--max-features", type=int, default=DEFAULT_MAX_FEATURES)
+    parser.add_argument("--min-df", type=float, default=1)
+    parser.add_argument("--max-df", type=float, default=1.0)
+    parser.add_argument("--hashing", action="store_true", help="Hash terms instead of fitting a vocabulary")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES, help="Hashed columns with --hashing")
+    parser.add_argument("--update-df", action="store_true",
+                        help="Add the corpus to the document-frequency table of the hashing model at --output")
+    args = parser.parse_args()
+
+    min_df = int(args.min_df) if args.min_df >= 1 else args.min_df
+    documents = read_corpus(args.corpus)
+    if args.update_df:
+        table = update_document_frequencies(documents, args.output)
+        print(f"✅ Document-frequency table now covers {table.n_documents} documents (version {table.version})")
+        sys.exit(0)
+    if args.hashing:
+        print(f"Building hashing TF-IDF model on {len(documents)} documents...")
+        model, table = fit_hashing_model(documents, args.n_features)
+        path = save_tfidf_model(model, args.output)
+        table.save(df_table_path(path))
+        print(f"✅ Saved hashing TF-IDF model {model['version']} ({args.n_features} columns) to {path} "
+              f"and its document-frequency table to {df_table_path(path)}")
+        sys.exit(0)
+    print(f"Fitting TF-IDF model on {len(documents)} documents...")
+    model = fit_tfidf_model(documents, args.max_features, min_df, args.max_df)
+    path = save_tfidf_model(model, args.output)
+    print(f"✅ Saved TF-IDF model {model['version']} "
+          f"({len(model['vectorizer'].vocabulary_)} features) to {path}")
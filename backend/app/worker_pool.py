@@ -0,0 +1,182 @@
+import asyncio
+import os
+import time
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+try:
+    from backend.utils import log_utils, metrics, profiler
+except ImportError:
+    import log_utils
+    import metrics
+    import profiler
+
+# Number of worker processes used for PDF extraction and TF-IDF scoring.
+# Defaults to the number of CPU cores.
+POOL_WORKERS = int(os.getenv("POOL_WORKERS", "0")) or os.cpu_count() or 1
+
+# Maximum number of tasks allowed to be running or waiting in the pool.
+# Requests beyond this limit are rejected instead of piling up.
+POOL_QUEUE_DEPTH = int(os.getenv("POOL_QUEUE_DEPTH", "0")) or POOL_WORKERS * 4
+
+_executor = None
+_pending = 0
+# Set by defer_pool_start(): pool tasks wait for it before workers may be forked
+_start_allowed = None
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when the worker pool queue is full."""
+
+
+class PoolBrokenError(PoolBusyError):
+    """Raised for a task lost because a worker process died; the pool is rebuilt."""
+
+
+def _run_task(request_debug, profile, func, *args):
+    """
+    Worker-side wrapper that carries the request's debug and profiling switches
+    into the worker and sends the metrics (and profile) recorded there back with
+    the result.
+
+    Returns:
+        tuple: (result, metric events, seconds spent in func, profile or None)
+    """
+    log_utils.configure_logging()
+    token = log_utils.set_request_debug(request_debug)
+    start = time.perf_counter()
+    try:
+        with metrics.collect_worker_events() as events:
+            if not profile:
+                return func(*args), events, time.perf_counter() - start, None
+            with profiler.sample_current_thread() as profile_result:
+                result = func(*args)
+        return result, events, time.perf_counter() - start, profile_result
+    finally:
+        log_utils.reset_request_debug(token)
+
+
+def pool_broken():
+    """
+    Return True if a worker process died (OOM kill, crash in a native library)
+    and the pool can't run tasks until it is rebuilt.
+    """
+    return _executor is not None and bool(getattr(_executor, "_broken", False))
+
+
+def _discard_executor(executor):
+    """
+    Drop a broken pool so the next get_executor() call builds a new one.
+    """
+    global _executor
+    if _executor is executor:
+        _executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def defer_pool_start():
+    """
+    Make pool tasks wait until allow_pool_start() is called.
+
+    Used while modules are preloaded in a background thread: forking the workers
+    while that thread is importing could deadlock them. Call from the event loop.
+    """
+    global _start_allowed
+    _start_allowed = asyncio.Event()
+
+
+def allow_pool_start():
+    """
+    Let pool tasks held back by defer_pool_start() run.
+    """
+    if _start_allowed is not None:
+        _start_allowed.set()
+
+
+def get_executor():
+    """
+    Return the shared process pool, creating it on first use or after it broke.
+    """
+    global _executor
+    if pool_broken():
+        _discard_executor(_executor)
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+    return _executor
+
+
+async def run_in_pool(func, *args):
+    """
+    Run a CPU-bound function in the process pool without blocking the event loop.
+
+    Args:
+        func: Module-level (picklable) function to call
+        *args: Arguments passed to the function
+
+    Returns:
+        The function's return value
+
+    Raises:
+        PoolBusyError: If POOL_QUEUE_DEPTH tasks are already queued or running
+        PoolBrokenError: If a worker process died while the task was pending
+    """
+    global _pending
+    if _pending >= POOL_QUEUE_DEPTH:
+        raise PoolBusyError(f"Server busy: {_pending} tasks already queued")
+    _pending += 1
+    try:
+        if _start_allowed is not None:
+            await _start_allowed.wait()
+        loop = asyncio.get_running_loop()
+        profile = profiler.current_profile()
+        task = functools.partial(_run_task, log_utils.request_debug_enabled(), profile is not None, func, *args)
+        start = time.perf_counter()
+        executor = get_executor()
+        try:
+            result, events, work_seconds, profile_result = await loop.run_in_executor(executor, task)
+        except BrokenProcessPool as e:
+            _discard_executor(executor)
+            raise PoolBrokenError("A worker process died; please retry") from e
+        # Queueing and pickling overhead, as opposed to time spent working
+        metrics.observe_stage("pool_wait", max(0.0, time.perf_counter() - start - work_seconds))
+        metrics.replay_worker_events(events)
+        if profile is not None and profile_result is not None:
+            profile.add_worker_result(profile_result)
+        return result
+    finally:
+        _pending -= 1
+
+
+async def warm_up_pool():
+    """
+    Start the worker processes now rather than on the first request.
+
+    Workers are forked from the current process, so anything imported or loaded
+    before this call (model, PDF backends) is already there in every worker.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    await asyncio.gather(*(loop.run_in_executor(executor, os.getpid) for _ in range(POOL_WORKERS)))
+
+
+def pool_stats():
+    """
+    Return current pool sizing and queue usage, as /metrics gauges.
+    """
+    return {
+        "pool_ready": int(not pool_broken()),
+        "pool_workers": POOL_WORKERS,
+        "pool_queue_limit": POOL_QUEUE_DEPTH,
+        "pool_in_flight": min(_pending, POOL_WORKERS),
+        "pool_queued": max(0, _pending - POOL_WORKERS),
+    }
+
+
+def shutdown_pool():
+    """
+    Shut down the process pool, if it was started.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,63 @@
+import os
+import logging
+import contextvars
+
+# Global log level; detailed traces are DEBUG and off by default
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Set for the duration of a request that asked for detailed traces
+_request_debug = contextvars.ContextVar("request_debug", default=False)
+
+
+def configure_logging():
+    """
+    Install a stream handler on the root logger at LOG_LEVEL, unless one exists.
+    """
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+    else:
+        root.setLevel(LOG_LEVEL)
+
+
+def set_request_debug(enabled):
+    """
+    Turn detailed traces on or off for the current request (context).
+
+    Returns:
+        A token for reset_request_debug
+    """
+    return _request_debug.set(bool(enabled))
+
+
+def reset_request_debug(token):
+    _request_debug.reset(token)
+
+
+def request_debug_enabled():
+    return _request_debug.get()
+
+
+def debug_enabled(logger):
+    """
+    Return True if DEBUG traces should be produced, globally or for this request.
+
+    Use it to guard trace calls whose arguments are expensive to compute.
+    """
+    return _request_debug.get() or logger.isEnabledFor(logging.DEBUG)
+
+
+def trace(logger, msg, *args):
+    """
+    Log a DEBUG trace with lazy %-formatting.
+
+    At the default level this is a context variable lookup and a cached level
+    check: no formatting and no I/O. When the current request enabled debug
+    traces, the record is emitted even if the logger itself is above DEBUG.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args, stacklevel=2)
+    elif _request_debug.get():
+        fn, lineno, func, _ = logger.findCaller(stacklevel=2)
+        logger.handle(logger.makeRecord(logger.name, logging.DEBUG, fn, lineno, msg, args, None, func))
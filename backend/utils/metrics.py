@@ -0,0 +1,237 @@
+import time
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "resume_analyzer_"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# HELP text of each metric, also the list of names rendered by /metrics
+METRIC_HELP = {
+    "stage_duration_seconds": "Time spent in each processing stage",
+    "request_duration_seconds": "Total request handling time",
+    "requests_total": "HTTP requests handled",
+    "pages_processed_total": "PDF pages extracted",
+    "ocr_pages_total": "PDF pages without a usable text layer that were OCR'd",
+    "pdf_backend_fallbacks_total": "Text-layer backends skipped by the auto chain",
+    "extraction_truncated_total": "Extractions stopped early by a cut-off",
+    "pdf_cache_hits_total": "Extracted documents served from the PDF text cache",
+    "pdf_cache_misses_total": "PDF text cache lookups that had to extract",
+    "analysis_cache_hits_total": "Match analyses served from the analysis cache",
+    "analysis_cache_misses_total": "Analysis cache lookups that had to analyze",
+    "not_modified_total": "Conditional match requests answered with 304 Not Modified",
+}
+
+# HELP text of the gauges sampled when /metrics is rendered (see render_metrics)
+GAUGE_HELP = {
+    "pool_ready": "1 unless a worker process died and the pool has not been rebuilt yet",
+    "pool_workers": "Worker processes of the extraction and scoring pool",
+    "pool_queue_limit": "Pool tasks allowed to be running or waiting (POOL_QUEUE_DEPTH)",
+    "pool_in_flight": "Pool tasks currently running",
+    "pool_queued": "Pool tasks waiting for a free worker",
+}
+
+# Stage timings of the current request, for the Server-Timing header
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+# Set inside pool workers: events are buffered here and replayed in the API process
+_worker_events = contextvars.ContextVar("worker_events", default=None)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe histograms and counters rendered in the Prometheus text format.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, labels=()):
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # One count per bucket, then sum and count
+                histogram = self._histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+    def increment(self, name, amount=1, labels=()):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render(self):
+        """
+        Return every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+            counters = dict(self._counters)
+        lines = []
+        for name, help_text in METRIC_HELP.items():
+            metric = METRIC_PREFIX + name
+            if name.endswith("_total"):
+                series = sorted((key, value) for key, value in counters.items() if key[0] == name)
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                lines += [f"{metric}{_format_labels(labels)} {value}" for (_, labels), value in series]
+                continue
+            series = sorted((key, values) for key, values in histograms.items() if key[0] == name)
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for (_, labels), values in series:
+                for bound, count in zip(self.buckets, values):
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', repr(bound)),))} {count}")
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {values[-1]}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {values[-2]}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+registry = MetricsRegistry()
+
+
+def observe_stage(stage, seconds):
+    """
+    Record the duration of a processing stage.
+    """
+    events = _worker_events.get()
+    if events is not None:
+        events.append(("stage", stage, seconds))
+        return
+    registry.observe("stage_duration_seconds", seconds, (("stage", stage),))
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+def increment(name, amount=1, **labels):
+    """
+    Add amount to the counter name (one of the *_total entries of METRIC_HELP).
+    """
+    events = _worker_events.get()
+    if events is not None:
+        events.append(("counter", name, amount, labels))
+        return
+    registry.increment(name, amount, tuple(sorted(labels.items())))
+
+
+@contextmanager
+def stage(name):
+    """
+    Time the enclosed block as processing stage name.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """
+    Decorator timing every call of a function as processing stage name.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe_stage(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def start_request_timings():
+    """
+    Start collecting stage timings for the current request.
+
+    Returns:
+        A token for finish_request_timings
+    """
+    return _request_timings.set([])
+
+
+def finish_request_timings(token):
+    """
+    Stop collecting and return the request's (stage, seconds) pairs in order.
+    """
+    timings = _request_timings.get() or []
+    _request_timings.reset(token)
+    return timings
+
+
+def server_timing_header(timings):
+    """
+    Format (stage, seconds) pairs as a Server-Timing header value.
+
+    Repeated stages (e.g. two PDFs extracted concurrently) are summed.
+    """
+    totals = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items())
+
+
+@contextmanager
+def collect_worker_events():
+    """
+    Buffer the metrics recorded in the enclosed block (inside a pool worker).
+
+    Yields:
+        list: Events to pass to replay_worker_events in the API process
+    """
+    events = []
+    token = _worker_events.set(events)
+    try:
+        yield events
+    finally:
+        _worker_events.reset(token)
+
+
+def replay_worker_events(events):
+    """
+    Record events buffered by collect_worker_events in this process.
+    """
+    for event in events:
+        if event[0] == "stage":
+            observe_stage(event[1], event[2])
+        else:
+            increment(event[1], event[2], **event[3])
+
+
+def observe_request(path, status, seconds):
+    """
+    Record one handled HTTP request.
+    """
+    labels = (("path", path),)
+    registry.observe("request_duration_seconds", seconds, labels)
+    registry.increment("requests_total", 1, labels + (("status", str(status)),))
+
+
+def render_metrics(gauges=None):
+    """
+    Render every metric, plus current gauge values {name in GAUGE_HELP: value}.
+    """
+    lines = []
+    for name, value in (gauges or {}).items():
+        metric = METRIC_PREFIX + name
+        lines += [f"# HELP {metric} {GAUGE_HELP[name]}", f"# TYPE {metric} gauge", f"{metric} {value}"]
+    return registry.render() + "".join(line + "\n" for line in lines)
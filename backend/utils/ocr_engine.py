@@ -0,0 +1,199 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from backend.app.worker_pool import POOL_WORKERS
+except ImportError:
+    # Run from backend/utils without the repository root on sys.path
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+    from worker_pool import POOL_WORKERS
+
+# Rendering resolution for OCR. 200 DPI matches the old convert_from_path default.
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+# Grayscale pages are a third of the size of RGB ones and OCR just as well.
+OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "1").lower() in ("1", "true", "yes")
+# Tesseract page-segmentation mode (3 = fully automatic, tesseract's default).
+OCR_PSM = int(os.getenv("OCR_PSM", "3"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+# Number of pages OCR'd in parallel by one process. Every worker of the API's
+# process pool (POOL_WORKERS, one per core by default) runs its own OCR threads,
+# so by default the cores are split between them instead of each using them all.
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "0")) or max(1, (os.cpu_count() or 1) // POOL_WORKERS)
+
+# Each tesseract process would otherwise start one OpenMP thread per core,
+# oversubscribing the CPU when several pages are OCR'd at once.
+if OCR_WORKERS * POOL_WORKERS > 1:
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+_executor = None
+_executor_lock = threading.Lock()
+# pdfium is not thread-safe, so all rendering goes through this lock
+pdfium_lock = threading.Lock()
+
+
+def get_ocr_executor():
+    """
+    Return the OCR worker pool, creating it on first use.
+
+    The pool lives for the whole process, so its threads are reused across
+    documents instead of being started for every call.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+        return _executor
+
+
+def read_pdf_source(source):
+    """
+    Return a path or raw bytes for a path, bytes or binary file-like source.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source.read()
+    return str(source)
+
+
+def iter_page_images(source, page_numbers=None, dpi=None, grayscale=None):
+    """
+    Render PDF pages one at a time.
+
+    Pages are rendered in-process with pypdfium2 when it is installed, otherwise
+    page by page through poppler (pdf2image), so only one rendered page is held
+    by the generator at a time.
+
+    Args:
+        source: Path, raw bytes or binary file-like object of the PDF
+        page_numbers (list, optional): 1-based page numbers, defaults to all pages
+        dpi (int, optional): Rendering resolution, defaults to OCR_DPI
+        grayscale (bool, optional): Render in grayscale, defaults to OCR_GRAYSCALE
+
+    Yields:
+        tuple: (page_number, PIL.Image)
+    """
+    dpi = dpi or OCR_DPI
+    grayscale = OCR_GRAYSCALE if grayscale is None else grayscale
+    source = read_pdf_source(source)
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        with pdfium_lock:
+            pdf = pdfium.PdfDocument(source)
+            page_count = len(pdf)
+        try:
+            for page_number in page_numbers or range(1, page_count + 1):
+                with pdfium_lock:
+                    page = pdf[page_number - 1]
+                    image = page.render(scale=dpi / 72, grayscale=grayscale).to_pil()
+                    page.close()
+                yield page_number, image
+        finally:
+            with pdfium_lock:
+                pdf.close()
+        return
+
+    from pdf2image import convert_from_path, convert_from_bytes, pdfinfo_from_path, pdfinfo_from_bytes
+    if isinstance(source, bytes):
+        convert, pdfinfo = convert_from_bytes, pdfinfo_from_bytes
+    else:
+        convert, pdfinfo = convert_from_path, pdfinfo_from_path
+    if not page_numbers:
+        page_numbers = range(1, pdfinfo(source)["Pages"] + 1)
+    for page_number in page_numbers:
+        images = convert(source, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=grayscale)
+        yield page_number, images[0]
+
+
+def text_layer_char_counts(source, max_pages=None):
+    """
+    Count the text-layer characters on each page without any layout analysis.
+
+    Uses pypdfium2's character count, which is much cheaper than a pdfplumber
+    parse, and falls back to pdfplumber's char objects if pypdfium2 is missing.
+
+    Args:
+        source: Path, raw bytes or binary file-like object of the PDF
+        max_pages (int, optional): Only count the first max_pages pages (0 or None: all)
+
+    Returns:
+        tuple: (list of character counts of the counted pages in page order,
+        total number of pages in the document)
+    """
+    source = read_pdf_source(source)
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        with pdfium_lock:
+            pdf = pdfium.PdfDocument(source)
+            try:
+                page_count = len(pdf)
+                counts = []
+                for index in range(min(page_count, max_pages) if max_pages else page_count):
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    counts.append(textpage.count_chars())
+                    textpage.close()
+                    page.close()
+                return counts, page_count
+            finally:
+                pdf.close()
+
+    import io
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source) as pdf:
+        pages = pdf.pages[:max_pages] if max_pages else pdf.pages
+        return [len(page.chars) for page in pages], len(pdf.pages)
+
+
+def _ocr_image(image, lang, config):
+    import pytesseract
+    try:
+        return pytesseract.image_to_string(image, lang=lang, config=config)
+    finally:
+        image.close()
+
+
+def ocr_pdf(source, page_numbers=None, dpi=None, grayscale=None, psm=None, lang=None):
+    """
+    OCR PDF pages in parallel and return their text in page order.
+
+    Pages are streamed from the renderer into the OCR pool; at most twice
+    OCR_WORKERS rendered pages are waiting in memory at any time.
+
+    Args:
+        source: Path, raw bytes or binary file-like object of the PDF
+        page_numbers (list, optional): 1-based page numbers, defaults to all pages
+        dpi (int, optional): Rendering resolution, defaults to OCR_DPI
+        grayscale (bool, optional): Render in grayscale, defaults to OCR_GRAYSCALE
+        psm (int, optional): Tesseract page-segmentation mode, defaults to OCR_PSM
+        lang (str, optional): Tesseract language, defaults to OCR_LANG
+
+    Returns:
+        list: OCR text of each requested page, in page order
+    """
+    config = f"--psm {OCR_PSM if psm is None else psm}"
+    lang = lang or OCR_LANG
+    executor = get_ocr_executor()
+    in_flight = threading.BoundedSemaphore(OCR_WORKERS * 2)
+    futures = []
+    try:
+        for _, image in iter_page_images(source, page_numbers, dpi, grayscale):
+            in_flight.acquire()
+            future = executor.submit(_ocr_image, image, lang, config)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
+    return [future.result() for future in futures]
@@ -1,44 +1,253 @@
 
-import pdfplumber
-from pdf2image import convert_from_path
-from PIL import Image
-import pytesseract
 import pathlib
+import io
+import os
 import re
-from bs4 import BeautifulSoup
+import sys
+import time
+import json
+import hashlib
+import logging
+import importlib
+import threading
+from collections import OrderedDict
+try:
+    from backend.utils import ocr_engine, text_normalizer, metrics
+    from backend.utils.log_utils import trace
+except ImportError:
+    import ocr_engine
+    import text_normalizer
+    import metrics
+    from log_utils import trace
 
-def extract_with_pdfplumber(file_path):
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction or cleaning changes so cached text from older code is not reused
+EXTRACTOR_VERSION = "5"
+
+# Pages whose text layer has fewer characters than this are OCR'd instead
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+
+# Text-layer backend: "auto" walks PDF_BACKEND_CHAIN, or name one of EXTRACTION_BACKENDS
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+# Backends tried by "auto", fastest first
+PDF_BACKEND_CHAIN = [name.strip() for name in os.getenv("PDF_BACKEND_CHAIN", "pypdfium2,pdfplumber,pypdf2").split(",") if name.strip()]
+# Minimum text_quality for "auto" to accept a backend's output without trying the next one
+PDF_MIN_TEXT_QUALITY = float(os.getenv("PDF_MIN_TEXT_QUALITY", "0.9"))
+
+# Per-request extraction cut-offs (0 disables a limit). A resume rarely needs more
+# than a few pages of text to be scored.
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "20"))
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "100000"))
+EXTRACT_TIME_BUDGET = float(os.getenv("EXTRACT_TIME_BUDGET", "60"))
+
+# Bundled PDFs used by the benchmark mode
+SAMPLE_PDFS = ["TABLE.pdf", "sample-tables.pdf", "Lorem_ipsum.pdf", "PDF_with_symbols.pdf"]
+
+def open_pdf_source(source):
+    """
+    Normalize a PDF source for the extraction libraries.
+
+    Args:
+        source: File path, raw PDF bytes or a binary file-like object
+
+    Returns:
+        A path or a seekable binary stream
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+def extract_with_pdfplumber(file_path, page_numbers=None):
     """
     Extract text from PDF using pdfplumber.
+
+    Args:
+        file_path: Path to the PDF, its raw bytes or a binary file-like object
+        page_numbers (list, optional): 1-based pages to extract, defaults to all pages
+
+    Returns:
+        list: Text of each extracted page, in page order
+    """
+    import pdfplumber
+    with pdfplumber.open(open_pdf_source(file_path), pages=page_numbers) as pdf:
+        return [page.extract_text() or '' for page in pdf.pages]
+
+def extract_with_pypdfium2(file_path, page_numbers=None):
+    """
+    Extract text from PDF using pypdfium2 (no layout analysis, much faster than pdfplumber).
+
+    Args:
+        file_path: Path to the PDF, its raw bytes or a binary file-like object
+        page_numbers (list, optional): 1-based pages to extract, defaults to all pages
+
+    Returns:
+        list: Text of each extracted page, in page order
+    """
+    import pypdfium2 as pdfium
+    with ocr_engine.pdfium_lock:
+        pdf = pdfium.PdfDocument(ocr_engine.read_pdf_source(file_path))
+        try:
+            texts = []
+            for page_number in page_numbers or range(1, len(pdf) + 1):
+                page = pdf[page_number - 1]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+def extract_with_pypdf2(file_path, page_numbers=None):
+    """
+    Extract text from PDF using PyPDF2 (pure Python).
+
+    Args:
+        file_path: Path to the PDF, its raw bytes or a binary file-like object
+        page_numbers (list, optional): 1-based pages to extract, defaults to all pages
+
+    Returns:
+        list: Text of each extracted page, in page order
     """
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ''
-    return text
+    from PyPDF2 import PdfReader
+    reader = PdfReader(open_pdf_source(file_path))
+    return [reader.pages[n - 1].extract_text() or '' for n in page_numbers or range(1, len(reader.pages) + 1)]
+
+# Text-layer extraction backends. Each takes (file_path, page_numbers) and
+# returns the text of the requested pages in page order.
+EXTRACTION_BACKENDS = {
+    "pdfplumber": extract_with_pdfplumber,
+    "pypdfium2": extract_with_pypdfium2,
+    "pypdf2": extract_with_pypdf2,
+}
+
+# Module each backend imports on first use
+BACKEND_MODULES = {
+    "pdfplumber": "pdfplumber",
+    "pypdfium2": "pypdfium2",
+    "pypdf2": "PyPDF2",
+}
+# Modules used by OCR (ocr_engine) and HTML cleanup (text_normalizer)
+OCR_MODULES = ["pytesseract", "pdf2image", "bs4"]
 
-def extract_with_ocr(file_path):
+def preload_modules(backend=None):
     """
-    Extract text from PDF using OCR if pdfplumber fails.
+    Import the modules extraction will need, ahead of the first request.
+
+    Covers every backend "auto" may try (or just the named backend) and the
+    OCR and cleanup modules. Modules that are not installed are skipped.
+
+    Returns:
+        list: Names of the modules that could not be imported
+    """
+    backend = backend or PDF_BACKEND
+    names = PDF_BACKEND_CHAIN if backend == "auto" else [backend]
+    missing = []
+    for module in [BACKEND_MODULES[name] for name in names if name in BACKEND_MODULES] + OCR_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            missing.append(module)
+    if missing:
+        logger.warning("Modules not available for PDF extraction: %s", ", ".join(missing))
+    return missing
+
+_CID_PATTERN = re.compile(r'\(cid:\d+\)')
+_READABLE_CHARS = re.compile(r'[\w\s.,;:!?()\[\]\'"/&%+@#*•➢-]')
+
+class UnknownBackendError(ValueError):
+    """Raised when a PDF backend name is not in EXTRACTION_BACKENDS."""
+
+def validate_backend(backend):
+    """
+    Raise UnknownBackendError unless backend is None, "auto" or a registered backend.
+    """
+    if backend and backend != "auto" and backend not in EXTRACTION_BACKENDS:
+        raise UnknownBackendError(f"Unknown PDF backend '{backend}'. Choose from: auto, {', '.join(EXTRACTION_BACKENDS)}")
+
+def text_quality(text, expected_chars=None):
+    """
+    Score extracted text between 0 and 1.
+
+    The score is the share of readable characters (letters, digits, whitespace and
+    common punctuation; unmapped "(cid:N)" glyphs count as unreadable), scaled down
+    when the text is much shorter than the text layer's character count.
+
+    Args:
+        text (str): Extracted text
+        expected_chars (int, optional): Character count reported by the text layer
+    """
+    if not text or not text.strip():
+        return 0.0
+    unreadable = sum(len(m) for m in _CID_PATTERN.findall(text))
+    stripped = _CID_PATTERN.sub('', text)
+    unreadable += len(_READABLE_CHARS.sub('', stripped))
+    score = 1 - unreadable / len(text)
+    if expected_chars:
+        coverage = len(''.join(text.split())) / expected_chars
+        score *= min(1.0, coverage * 2)
+    return score
+
+@metrics.timed("text_layer")
+def extract_text_layer(file_path, page_numbers, backend=None, expected_chars=None):
+    """
+    Extract text-layer pages with the chosen backend, or the "auto" fallback chain.
+
+    With "auto", backends in PDF_BACKEND_CHAIN are tried in order and the first whose
+    output scores at least PDF_MIN_TEXT_QUALITY wins; otherwise the best-scoring
+    output is used. A backend that is not installed or raises is skipped.
+
+    Returns:
+        tuple: (list of page texts, name of the backend used)
+    """
+    backend = backend or PDF_BACKEND
+    if backend != "auto":
+        validate_backend(backend)
+        return EXTRACTION_BACKENDS[backend](file_path, page_numbers), backend
+
+    best = None
+    for name in PDF_BACKEND_CHAIN:
+        try:
+            texts = EXTRACTION_BACKENDS[name](file_path, page_numbers)
+        except Exception as e:
+            logger.warning("PDF backend %s failed: %s", name, e)
+            metrics.increment("pdf_backend_fallbacks_total", backend=name, reason="error")
+            continue
+        quality = text_quality("\n".join(texts), expected_chars)
+        if quality >= PDF_MIN_TEXT_QUALITY:
+            return texts, name
+        metrics.increment("pdf_backend_fallbacks_total", backend=name, reason="quality")
+        trace(logger, "PDF backend %s text quality %.2f is below %s, trying next backend", name, quality, PDF_MIN_TEXT_QUALITY)
+        if best is None or quality > best[0]:
+            best = (quality, texts, name)
+    if best is None:
+        raise RuntimeError("No PDF extraction backend could read this file")
+    return best[1], best[2]
+
+@metrics.timed("ocr")
+def extract_with_ocr(file_path, page_numbers=None):
+    """
+    Extract text from PDF pages using OCR.
+    Pages are rendered one at a time and OCR'd in parallel (see ocr_engine).
+
+    Returns:
+        list: OCR text of each requested page (empty strings if OCR is unavailable)
     """
     try:
-        from pdf2image import convert_from_path
-        import pytesseract
-        images = convert_from_path(file_path)
-        text = ""
-        for img in images:
-            text += pytesseract.image_to_string(img)
-        return text
+        return ocr_engine.ocr_pdf(file_path, page_numbers)
     except ImportError as e:
-        print(f"OCR dependencies not available: {e}")
-        return ""
+        logger.warning("OCR dependencies not available: %s", e)
     except Exception as e:
-        print(f"OCR extraction failed: {e}")
-        return ""
+        logger.warning("OCR extraction failed: %s", e)
+    return [''] * len(page_numbers or [])
 
 def clean_extracted_text(text):
     """
     Clean extracted text by removing HTML tags, bullet points, extra whitespace, and newlines.
+    See text_normalizer.clean_text.
     
     Args:
         text (str): Raw extracted text
@@ -46,31 +255,155 @@ def clean_extracted_text(text):
     Returns:
         str: Cleaned text
     """
-    # Remove HTML tags if any
-    text = BeautifulSoup(text, "html.parser").get_text()
-    
-    # Remove bullet points and special characters
-    text = re.sub(r'[•➢]', '', text)  # Remove common bullet points
-    text = re.sub(r'[^\w\s.,-]', '', text)  # Keep alphanumeric, spaces, and basic punctuation
-    text = re.sub(r'\n+', ' ', text)  # Replace newlines with spaces
-    text = re.sub(r'\s+', ' ', text).strip()  # Normalize whitespace
-    text = re.sub(r'\bxx\b', '', text)     # Remove standalone 'xx'
-    text = re.sub(r'\b\d{2}xx\b', '', text)  # Remove year placeholders like 20xx, 19xx
+    return text_normalizer.clean_text(text)
 
-    
-    return text
+def iter_document_pages(file_path, backend=None, max_pages=None, max_chars=None, time_budget=None):
+    """
+    Extract a PDF page by page, yielding cleaned text as soon as each page is ready.
+
+    Pages are processed in small batches so the OCR pool can still work on several
+    pages at once. The generator stops at the first cut-off reached; a consumer that
+    has read enough can also simply stop iterating and no further pages are parsed.
+
+    Args:
+        file_path: Path to the PDF, its raw bytes or a binary file-like object
+        backend (str, optional): Text-layer backend name or "auto", defaults to PDF_BACKEND
+        max_pages (int, optional): Read at most this many pages, defaults to EXTRACT_MAX_PAGES
+        max_chars (int, optional): Stop once this many cleaned characters were yielded
+            (the last page is truncated), defaults to EXTRACT_MAX_CHARS
+        time_budget (float, optional): Don't start new batches of pages after this many
+            seconds (the first batch is always read), defaults to EXTRACT_TIME_BUDGET
+
+    Yields:
+        dict: "page" (1-based), cleaned "text", "ocr" (True if the text came from OCR),
+        "backend" and "page_count".
+        If a cut-off stopped extraction, a final {"truncated": reason, "page_count": ...}
+        item is yielded.
+    """
+    max_pages = EXTRACT_MAX_PAGES if max_pages is None else max_pages
+    max_chars = EXTRACT_MAX_CHARS if max_chars is None else max_chars
+    time_budget = EXTRACT_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.monotonic() + time_budget if time_budget else None
+
+    source = ocr_engine.read_pdf_source(file_path)
+    with metrics.stage("page_probe"):
+        # Pages past max_pages are never read, so they are not probed either
+        char_counts, page_count = ocr_engine.text_layer_char_counts(source, max_pages)
+    last_page = len(char_counts)
+    # One page per OCR thread of this process
+    batch_size = max(1, ocr_engine.OCR_WORKERS)
+    chars_read = 0
+
+    for batch_start in range(1, last_page + 1, batch_size):
+        if deadline is not None and batch_start > 1 and time.monotonic() > deadline:
+            yield {"truncated": "time_budget", "page_count": page_count}
+            return
+        batch = range(batch_start, min(batch_start + batch_size, last_page + 1))
+        page_texts = {}
+        used_backend = None
+
+        text_pages = [n for n in batch if char_counts[n - 1] >= OCR_MIN_PAGE_CHARS]
+        if text_pages:
+            expected_chars = sum(char_counts[n - 1] for n in text_pages)
+            texts, used_backend = extract_text_layer(source, text_pages, backend, expected_chars)
+            page_texts.update(zip(text_pages, texts))
+            # Keep the backend "auto" picked for the remaining batches
+            backend = used_backend
+
+        # Pages without a usable text layer, or whose text layer came back empty
+        ocr_candidates = [n for n in batch if not page_texts.get(n, '').strip()]
+        ocr_pages = set()
+        if ocr_candidates:
+            trace(logger, "No text layer on pages %s. Trying OCR...", ocr_candidates)
+            metrics.increment("ocr_pages_total", len(ocr_candidates))
+            for n, text in zip(ocr_candidates, extract_with_ocr(source, ocr_candidates)):
+                if text.strip():
+                    page_texts[n] = text
+                    ocr_pages.add(n)
+            # OCR unavailable or found nothing: keep what little text layer these pages have
+            fallback_pages = [n for n in ocr_candidates
+                              if n not in ocr_pages and n not in page_texts and char_counts[n - 1] > 0]
+            if fallback_pages:
+                texts, fallback_backend = extract_text_layer(
+                    source, fallback_pages, backend, sum(char_counts[n - 1] for n in fallback_pages)
+                )
+                page_texts.update(zip(fallback_pages, texts))
+                used_backend = used_backend or fallback_backend
+
+        metrics.increment("pages_processed_total", len(batch))
+        for n in batch:
+            with metrics.stage("clean"):
+                text = clean_extracted_text(page_texts.get(n, ''))
+            if max_chars and chars_read + len(text) >= max_chars:
+                text = text[:max_chars - chars_read]
+                yield {"page": n, "text": text, "ocr": n in ocr_pages, "backend": used_backend, "page_count": page_count}
+                if n < page_count:
+                    yield {"truncated": "max_chars", "page_count": page_count}
+                return
+            chars_read += len(text)
+            yield {"page": n, "text": text, "ocr": n in ocr_pages, "backend": used_backend, "page_count": page_count}
+
+    if last_page < page_count:
+        yield {"truncated": "max_pages", "page_count": page_count}
+
+def extract_document(file_path, output_path=None, backend=None, max_pages=None, max_chars=None, time_budget=None):
+    """
+    Extract and clean text from any PDF, deciding per page between the text layer and OCR.
+
+    A cheap character count decides which pages have a usable text layer; those are
+    read with the text-layer backend and only the remaining pages are OCR'd. Pages
+    are merged back in page order. Extraction stops at the limits described in
+    iter_document_pages.
+
+    Args:
+        file_path: Path to the PDF, its raw bytes or a binary file-like object
+        output_path (str, optional): Path to save the cleaned text (debugging aid)
+        backend (str, optional): Text-layer backend name or "auto", defaults to PDF_BACKEND
+        max_pages, max_chars, time_budget: Cut-offs, see iter_document_pages
+
+    Returns:
+        dict: Cleaned "text", "page_count", "pages_read", the 1-based "ocr_pages" whose
+        text came from OCR, the text-layer "backend" used (None if every page was OCR'd) and
+        "truncated" (None, "max_pages", "max_chars" or "time_budget")
+    """
+    texts, ocr_pages, backends = [], [], []
+    page_count, pages_read, truncated = 0, 0, None
+    for page in iter_document_pages(file_path, backend, max_pages, max_chars, time_budget):
+        page_count = page["page_count"]
+        if "truncated" in page:
+            truncated = page["truncated"]
+            metrics.increment("extraction_truncated_total", reason=truncated)
+            break
+        pages_read += 1
+        if page["text"]:
+            texts.append(page["text"])
+        if page["ocr"]:
+            ocr_pages.append(page["page"])
+        if page["backend"] and page["backend"] not in backends:
+            backends.append(page["backend"])
+
+    text = " ".join(texts)
+    if not text:
+        trace(logger, "No text could be extracted. Returning empty text.")
+    if output_path:
+        save_text_to_file(text, output_path)
+    return {
+        "text": text,
+        "page_count": page_count,
+        "pages_read": pages_read,
+        "ocr_pages": ocr_pages,
+        "backend": backends[0] if backends else None,
+        "truncated": truncated,
+    }
 
 def extract_text_from_any_pdf(file_path):
     """
-    Extract and clean text from any PDF, using pdfplumber or OCR as fallback.
+    Extract and clean text from any PDF, using the text layer or OCR per page.
+
+    Args:
+        file_path: Path to the PDF, its raw bytes or a binary file-like object
     """
-    text = extract_with_pdfplumber(file_path)
-    if not text.strip():
-        print("No text found with pdfplumber. Trying OCR...")
-        text = extract_with_ocr(file_path)
-        if not text.strip():
-            print("OCR also failed. Returning empty text.")
-    return clean_extracted_text(text)
+    return extract_document(file_path)["text"]
 
 def save_text_to_file(text, output_path):
     """
@@ -83,27 +416,234 @@ def save_text_to_file(text, output_path):
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(text)
-        print(f"✅ Text successfully saved to {output_path}")
+        trace(logger, "Text successfully saved to %s", output_path)
     except Exception as e:
-        print(f"⚠️ Error saving file: {e}")
+        logger.warning("Error saving file: %s", e)
+
+def extraction_settings():
+    """
+    Return the configuration that extract_document's output depends on, as a string.
+    """
+    return json.dumps([
+        EXTRACT_MAX_PAGES, EXTRACT_MAX_CHARS, OCR_MIN_PAGE_CHARS, PDF_BACKEND_CHAIN, PDF_MIN_TEXT_QUALITY,
+        ocr_engine.OCR_DPI, ocr_engine.OCR_GRAYSCALE, ocr_engine.OCR_PSM, ocr_engine.OCR_LANG,
+    ])
 
-def textextractionfunction(file_path, output_path):
+class PdfTextCache:
     """
-    Main function to extract and save cleaned text from a PDF.
+    Content-addressed cache for extracted PDF documents (see extract_document).
+
+    Entries are keyed by a SHA-256 of the PDF bytes plus EXTRACTOR_VERSION and the
+    extraction settings (see make_key). The
+    in-memory tier is an LRU bounded by the total size of the cached text; the
+    optional on-disk tier keeps entries across restarts.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_bytes, backend=None):
+        """
+        Return the cache key for the given PDF bytes and text-layer backend.
+
+        The settings that change extracted text (cut-offs, backend chain, OCR
+        settings) are part of the key, so the disk tier doesn't return text
+        extracted under an older configuration.
+        """
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(f"extractor-v{EXTRACTOR_VERSION}:{backend or PDF_BACKEND}:{extraction_settings()}".encode())
+        return digest.hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Return the cached document for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                metrics.increment("pdf_cache_hits_total", tier="memory")
+                return entry[0]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+            except (OSError, ValueError):
+                document = None
+            if document is not None:
+                self._remember(key, document)
+                with self._lock:
+                    self.disk_hits += 1
+                metrics.increment("pdf_cache_hits_total", tier="disk")
+                return document
+        with self._lock:
+            self.misses += 1
+        metrics.increment("pdf_cache_misses_total")
+        return None
+
+    def put(self, key, document):
+        """
+        Store an extracted document under key in memory and, if enabled, on disk.
+        """
+        self._remember(key, document)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(document, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("Error writing PDF text cache entry: %s", e)
+
+    def _remember(self, key, document):
+        size = len(document["text"].encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (document, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def stats(self):
+        """
+        Return hit/miss counters and current memory usage.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "disk_dir": self.disk_dir,
+            }
+
+# Shared cache instance; PDF_CACHE_DIR enables the persistent on-disk tier
+pdf_text_cache = PdfTextCache(
+    max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    disk_dir=os.getenv("PDF_CACHE_DIR") or None,
+)
+
+def extract_document_cached(pdf_bytes, cache=None, backend=None, time_budget=None):
+    """
+    Extract a PDF document from its bytes, reusing a cached result when available.
+
+    Args:
+        pdf_bytes (bytes): Raw PDF content
+        cache (PdfTextCache, optional): Cache to use, defaults to pdf_text_cache
+        backend (str, optional): Text-layer backend name or "auto"
+        time_budget (float, optional): See iter_document_pages
+
+    Returns:
+        dict: Same as extract_document
+    """
+    cache = cache or pdf_text_cache
+    key = cache.make_key(pdf_bytes, backend)
+    document = cache.get(key)
+    if document is None:
+        document = extract_document(pdf_bytes, backend=backend, time_budget=time_budget)
+        # A time-budget cut-off depends on load, so don't let it stick in the cache
+        if document["truncated"] != "time_budget":
+            cache.put(key, document)
+    return document
+
+def textextractionfunction(file_path, output_path=None):
+    """
+    Main function to extract cleaned text from a PDF, optionally saving it.
     
     Args:
-        file_path (str): Path to the input PDF
-        output_path (str): Path to save the output text file
+        file_path: Path to the input PDF, its raw bytes or a binary file-like object
+        output_path (str, optional): Path to save the output text file (debugging aid)
     
     Returns:
         str: Cleaned extracted text
     """
-    text = extract_text_from_any_pdf(file_path)
-    save_text_to_file(text, output_path)
-    return text
+    return extract_document(file_path, output_path)["text"]
+
+def benchmark_backends(pdf_paths=None, repeat=3):
+    """
+    Measure text-layer extraction speed of every backend.
+
+    Args:
+        pdf_paths (list, optional): PDFs to extract, defaults to the bundled SAMPLE_PDFS
+        repeat (int): Number of timed runs per backend and file (best run is kept)
+
+    Returns:
+        dict: {backend: {"pages": int, "seconds": float, "pages_per_second": float,
+               "quality": float, "files": {name: {...}}}}
+    """
+    utils_dir = pathlib.Path(__file__).resolve().parent
+    pdf_paths = pdf_paths or [utils_dir / name for name in SAMPLE_PDFS]
+    documents = [(pathlib.Path(path).name, pathlib.Path(path).read_bytes()) for path in pdf_paths]
+
+    results = {}
+    for name, extract in EXTRACTION_BACKENDS.items():
+        total_pages, total_seconds, qualities, files = 0, 0.0, [], {}
+        for filename, data in documents:
+            try:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    texts = extract(data)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+            except Exception as e:
+                files[filename] = {"error": str(e)}
+                continue
+            quality = text_quality("\n".join(texts))
+            files[filename] = {
+                "pages": len(texts),
+                "seconds": round(best, 4),
+                "pages_per_second": round(len(texts) / best, 2) if best else None,
+                "quality": round(quality, 3),
+            }
+            total_pages += len(texts)
+            total_seconds += best
+            qualities.append(quality)
+        results[name] = {
+            "pages": total_pages,
+            "seconds": round(total_seconds, 4),
+            "pages_per_second": round(total_pages / total_seconds, 2) if total_seconds else None,
+            "quality": round(sum(qualities) / len(qualities), 3) if qualities else None,
+            "files": files,
+        }
+    return results
 
 if __name__ == "__main__":
-    outpath = pathlib.Path(__file__).resolve().parent
-    filepath = outpath / "sample.pdf"  # Adjust as needed
-    outputpath = outpath / "output.txt"
-    textextractionfunction(filepath, outputpath)
+    if "--benchmark" in sys.argv:
+        # python pdf_parser.py --benchmark [file.pdf ...]
+        paths = [arg for arg in sys.argv[1:] if arg != "--benchmark"]
+        for backend_name, result in benchmark_backends(paths or None).items():
+            print(f"{backend_name:<12} {result['pages']:>4} pages  {result['seconds']:>8.4f}s  "
+                  f"{result['pages_per_second'] or 0:>9.2f} pages/s  quality {result['quality']}")
+            for filename, file_result in result["files"].items():
+                print(f"    {filename:<28} {file_result}")
+    else:
+        outpath = pathlib.Path(__file__).resolve().parent
+        filepath = outpath / "sample.pdf"  # Adjust as needed
+        outputpath = outpath / "output.txt"
+        textextractionfunction(filepath, outputpath)
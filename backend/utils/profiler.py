@@ -0,0 +1,222 @@
+import os
+import sys
+import time
+import uuid
+import json
+import threading
+import tracemalloc
+import contextvars
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+# Profiling is off unless PROFILING_ENABLED=1; then a request opts in with "X-Profile: 1"
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+# Seconds between two stack samples
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+# Number of finished profiles kept in memory for GET /profiles/{profile_id}
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+# Optional directory where every profile is also written as <id>.collapsed and <id>.json
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+
+# Profile of the request being handled, if it asked for one
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Sampling profiler for one thread.
+
+    A background thread records the stack of the target thread every interval
+    seconds, and the resident set size along with it. Sampling adds no overhead
+    to the profiled code itself, so timings stay realistic.
+    """
+
+    def __init__(self, thread_id=None, interval=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval or PROFILE_SAMPLE_INTERVAL
+        self.stacks = Counter()
+        self.rss_peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            import psutil
+            process = psutil.Process()
+        except ImportError:
+            process = None
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(labels))] += 1
+            if process is not None:
+                self.rss_peak_bytes = max(self.rss_peak_bytes, process.memory_info().rss)
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0:
+            tracemalloc.start()
+        _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+    return peak
+
+
+@contextmanager
+def sample_current_thread():
+    """
+    Profile the enclosed block on the current thread.
+
+    Yields:
+        dict: Filled on exit with "stacks" (collapsed stack -> samples),
+        "tracemalloc_peak_bytes", "rss_peak_bytes" and "seconds"
+    """
+    result = {}
+    sampler = StackSampler()
+    _start_tracemalloc()
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield result
+    finally:
+        sampler.stop()
+        result.update({
+            "stacks": dict(sampler.stacks),
+            "tracemalloc_peak_bytes": _stop_tracemalloc(),
+            "rss_peak_bytes": sampler.rss_peak_bytes,
+            "seconds": time.perf_counter() - start,
+        })
+
+
+class RequestProfile:
+    """
+    Profile of one request: samples of the API process plus those sent back by
+    the pool workers that ran part of it.
+    """
+
+    def __init__(self, path):
+        self.profile_id = uuid.uuid4().hex
+        self.path = path
+        self.stacks = Counter()
+        self.summary = {}
+        self.worker_tracemalloc_peak_bytes = 0
+        self.worker_rss_peak_bytes = 0
+
+    def add_worker_result(self, result):
+        # Prefix so worker stacks form their own subtree in a flame graph
+        for stack, count in result["stacks"].items():
+            self.stacks[f"pool_worker;{stack}"] += count
+        self.worker_tracemalloc_peak_bytes = max(self.worker_tracemalloc_peak_bytes, result["tracemalloc_peak_bytes"])
+        self.worker_rss_peak_bytes = max(self.worker_rss_peak_bytes, result["rss_peak_bytes"])
+
+    def collapsed(self):
+        """
+        Return the samples in the collapsed-stack format read by flamegraph.pl and speedscope.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self):
+        return dict(
+            self.summary,
+            profile_id=self.profile_id,
+            path=self.path,
+            samples=sum(self.stacks.values()),
+            sample_interval=PROFILE_SAMPLE_INTERVAL,
+            worker_tracemalloc_peak_bytes=self.worker_tracemalloc_peak_bytes,
+            worker_rss_peak_bytes=self.worker_rss_peak_bytes,
+        )
+
+
+class ProfileStore:
+    """
+    Keeps the last max_entries request profiles, optionally also on disk.
+    """
+
+    def __init__(self, max_entries=PROFILE_KEEP, directory=PROFILE_DIR):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, profile):
+        with self._lock:
+            self._profiles[profile.profile_id] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            base = os.path.join(self.directory, profile.profile_id)
+            with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+                f.write(profile.collapsed())
+            with open(f"{base}.json", "w", encoding="utf-8") as f:
+                json.dump(profile.to_dict(), f)
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self):
+        with self._lock:
+            return [profile.to_dict() for profile in reversed(self._profiles.values())]
+
+
+profile_store = ProfileStore()
+
+
+@contextmanager
+def profile_request(path):
+    """
+    Profile everything the current request does on this thread and in the pool
+    workers it uses; the profile is stored in profile_store on exit.
+
+    Yields:
+        RequestProfile
+    """
+    profile = RequestProfile(path)
+    token = _current_profile.set(profile)
+    try:
+        with sample_current_thread() as result:
+            yield profile
+    finally:
+        _current_profile.reset(token)
+        profile.stacks.update(result.pop("stacks"))
+        profile.summary = result
+        profile_store.put(profile)
+
+
+def current_profile():
+    """
+    Return the RequestProfile of the current request, or None when not profiling.
+    """
+    return _current_profile.get()
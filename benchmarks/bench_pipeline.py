@@ -0,0 +1,174 @@
+"""
+Latency benchmarks of the extraction and scoring pipeline, with regression gates.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--repeat 20] [--only analyze] [--output report.json]
+    python benchmarks/bench_pipeline.py --save-baseline     # record benchmarks/baselines/pipeline.json
+    python benchmarks/bench_pipeline.py --threshold 0.25    # exit 1 if a case is >25% slower than the baseline
+
+Cases cover textextractionfunction on the bundled PDFs (text-layer path), OCR of
+the flattened sample (skipped when tesseract is not installed), preprocess_text,
+each analyzer in tfidf_analyzer and each endpoint through an in-process client.
+Every case reports p50/p95 latency, throughput and the peak RSS of the process
+and its pool workers. The PDF text and analysis caches are disabled unless
+--with-cache is given, so endpoint numbers include extraction and scoring.
+
+Baselines are only comparable on the machine (and model) they were recorded on.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+
+from common import (
+    TEXT_LAYER_PDFS, OCR_PDF, RESUME_PDF, SAMPLE_JOB_DESCRIPTION, BASELINE_DIR,
+    latency_summary, PeakRssSampler, environment, write_report, read_report, compare_to_baseline,
+    disable_caches,
+)
+
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, 'pipeline.json')
+
+
+def function_cases():
+    """
+    Return {case name: zero-argument callable} for the library-level cases.
+    """
+    from backend.utils.pdf_parser import textextractionfunction
+    from backend.utils import ocr_engine
+    import tfidf_analyzer
+
+    cases = {}
+    for path in TEXT_LAYER_PDFS:
+        cases[f"extract/{os.path.basename(path)}"] = lambda path=path: textextractionfunction(path)
+    if shutil.which("tesseract"):
+        cases[f"extract_ocr/{os.path.basename(OCR_PDF)}"] = lambda: ocr_engine.ocr_pdf(OCR_PDF)
+    else:
+        cases[f"extract_ocr/{os.path.basename(OCR_PDF)}"] = None
+
+    resume_text = textextractionfunction(RESUME_PDF)
+    job_text = SAMPLE_JOB_DESCRIPTION
+    resumes = [textextractionfunction(path) for path in TEXT_LAYER_PDFS]
+    cases.update({
+        "preprocess_text/resume": lambda: tfidf_analyzer.preprocess_text(resume_text),
+        "analyze_resume_with_tfidf": lambda: tfidf_analyzer.analyze_resume_with_tfidf(resume_text),
+        "analyze_job_description_with_tfidf": lambda: tfidf_analyzer.analyze_job_description_with_tfidf(job_text),
+        "calculate_resume_job_similarity": lambda: tfidf_analyzer.calculate_resume_job_similarity(resume_text, job_text),
+        "comprehensive_resume_job_analysis": lambda: tfidf_analyzer.comprehensive_resume_job_analysis(resume_text, job_text),
+        f"batch_resume_job_similarity/{len(resumes)}x3": lambda: tfidf_analyzer.batch_resume_job_similarity(
+            resumes, [job_text, resume_text[:2000], job_text.upper()]),
+    })
+    return cases
+
+
+def endpoint_cases(client):
+    """
+    Return {case name: zero-argument callable} posting to each endpoint.
+    """
+    with open(RESUME_PDF, 'rb') as f:
+        resume_pdf = f.read()
+    with open(TEXT_LAYER_PDFS[3], 'rb') as f:
+        job_pdf = f.read()
+
+    def post(path, files=None, data=None):
+        def call():
+            response = client.post(path, files=files, data=data)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+        return call
+
+    resume_file = {'file': ('resume.pdf', resume_pdf, 'application/pdf')}
+    return {
+        "endpoint/analyze-resume": post('/analyze-resume/', files=resume_file),
+        "endpoint/analyze-job-description": post('/analyze-job-description/', data={'job_description': SAMPLE_JOB_DESCRIPTION}),
+        "endpoint/analyze-job-description-pdf": post('/analyze-job-description-pdf/', files={'file': ('jd.pdf', job_pdf, 'application/pdf')}),
+        "endpoint/match-resume-job": post('/match-resume-job/', files=resume_file, data={'job_description': SAMPLE_JOB_DESCRIPTION}),
+        "endpoint/match-resume-job-pdf": post('/match-resume-job-pdf/', files={
+            'file': ('resume.pdf', resume_pdf, 'application/pdf'),
+            'jd_file': ('jd.pdf', job_pdf, 'application/pdf'),
+        }),
+    }
+
+
+def run_case(func, repeat, warmup):
+    """
+    Time repeat calls of func after warmup untimed calls.
+    """
+    for _ in range(warmup):
+        func()
+    latencies = []
+    with PeakRssSampler() as rss:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call_start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+    summary = latency_summary(latencies, elapsed)
+    summary["peak_rss_bytes"] = rss.peak_rss_bytes
+    summary["rss_growth_bytes"] = rss.peak_rss_bytes - rss.start_rss_bytes
+    return summary
+
+
+def run_cases(cases, args, results):
+    for name, func in cases.items():
+        if args.only and not any(pattern in name for pattern in args.only):
+            continue
+        if func is None:
+            results[name] = {"skipped": "dependency not installed"}
+            print(f"{name:<48} skipped")
+            continue
+        summary = run_case(func, args.repeat, args.warmup)
+        results[name] = summary
+        print(f"{name:<48} p50 {summary['p50_ms']:>9.2f} ms  p95 {summary['p95_ms']:>9.2f} ms  "
+              f"{summary['throughput_per_s']:>8.2f}/s  peak RSS {summary['peak_rss_bytes'] / 2**20:>7.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark extraction and scoring")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per case")
+    parser.add_argument("--only", nargs="*", help="Run only cases whose name contains one of these")
+    parser.add_argument("--skip-endpoints", action="store_true")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the PDF text and analysis caches enabled")
+    parser.add_argument("--output", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "mean_ms"])
+    args = parser.parse_args()
+
+    if not args.with_cache:
+        disable_caches(os.environ)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    results = {}
+    run_cases(function_cases(), args, results)
+    if not args.skip_endpoints:
+        from fastapi.testclient import TestClient
+        from backend.app.main import app
+        with TestClient(app) as client:
+            run_cases(endpoint_cases(client), args, results)
+
+    from tfidf_analyzer import model_version
+    report = {
+        "environment": environment(),
+        "settings": {"repeat": args.repeat, "warmup": args.warmup, "with_cache": args.with_cache,
+                     "model_version": model_version()},
+        "results": results,
+    }
+    if args.output:
+        print(f"Report written to {write_report(report, args.output)}")
+    if args.save_baseline:
+        print(f"Baseline written to {write_report(report, args.baseline)}")
+        sys.exit(0)
+
+    if os.path.exists(args.baseline):
+        baseline = read_report(args.baseline)
+        regressions = compare_to_baseline(results, baseline["results"], args.metric, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']}: {args.metric} {regression['baseline']} -> "
+                  f"{regression['current']} (+{regression['change']:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
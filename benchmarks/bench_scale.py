@@ -0,0 +1,125 @@
+"""
+Scale benchmark of resume ingestion and ranking on synthetic corpora.
+
+Usage:
+    python benchmarks/bench_scale.py [--sizes 10000 100000 1000000] [--hashing 1048576] [--output scale.json]
+
+A TF-IDF model is fitted on a synthetic sample (see synthetic_corpus.py), then
+resumes are ingested into a ResumeIndex through the same path as /index-resume/
+(vectorize_documents + ResumeIndex.add) until each size is reached. At every
+size the report records ingestion rate, index memory (CSR bytes and process RSS)
+and top-k query latency of ResumeIndex.rank. The index grows incrementally, so
+one run covers all sizes; 1M resumes needs several GB of RAM. With --hashing the
+model is a feature-hashing one with that many columns instead of a fitted
+vocabulary.
+"""
+import os
+import time
+import tempfile
+import argparse
+
+from common import latency_summary, PeakRssSampler, environment, write_report
+from synthetic_corpus import iter_resumes, iter_job_descriptions
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+# Documents the benchmark model is fitted on
+FIT_RESUMES = 5000
+FIT_JOBS = 500
+
+
+def fit_benchmark_model(seed, max_features, hashing=None):
+    """
+    Fit and load a TF-IDF model on a synthetic sample, as tfidf_model.py would.
+    With hashing (a number of columns), build a feature-hashing model instead.
+    """
+    from tfidf_model import fit_tfidf_model, fit_hashing_model, save_tfidf_model
+    from tfidf_analyzer import load_tfidf_model, df_table_path
+    documents = list(iter_resumes(FIT_RESUMES, seed=seed + 1)) + list(iter_job_descriptions(FIT_JOBS, seed=seed + 1))
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-scale-"), "tfidf_model.joblib")
+    if hashing:
+        model, table = fit_hashing_model(documents, n_features=hashing)
+        save_tfidf_model(model, path)
+        table.save(df_table_path(path))
+    else:
+        save_tfidf_model(fit_tfidf_model(documents, max_features=max_features), path)
+    return load_tfidf_model(path)
+
+
+def run(sizes, seed=42, queries=200, top_k=10, batch_size=1000, flush_every=50000, max_features=20000, hashing=None):
+    from resume_index import ResumeIndex, vectorize_documents
+
+    start = time.perf_counter()
+    model = fit_benchmark_model(seed, max_features, hashing)
+    fit_seconds = time.perf_counter() - start
+
+    job_vectors = vectorize_documents(list(iter_job_descriptions(queries, seed=seed)))
+    index = ResumeIndex()
+    resumes = iter_resumes(max(sizes), seed=seed)
+    ingested = 0
+    ingest_seconds = 0.0
+    results = []
+    sampler = PeakRssSampler()
+    with sampler:
+        for size in sorted(sizes):
+            segment_start, segment_seconds = ingested, 0.0
+            while ingested < size:
+                texts = [next(resumes) for _ in range(min(batch_size, size - ingested))]
+                batch_start = time.perf_counter()
+                vectors = vectorize_documents(texts)
+                for i in range(vectors.shape[0]):
+                    index.add(f"resume-{ingested + i}", vectors[i])
+                ingested += len(texts)
+                # Stack pending rows into the CSR matrix now and then, like a live index would
+                if ingested % flush_every < len(texts) or ingested == size:
+                    index.stats()
+                segment_seconds += time.perf_counter() - batch_start
+            ingest_seconds += segment_seconds
+
+            stats = index.stats()
+            latencies = []
+            for q in range(job_vectors.shape[0]):
+                query_start = time.perf_counter()
+                index.rank(job_vectors[q], top_k)
+                latencies.append(time.perf_counter() - query_start)
+            result = {
+                "resumes": size,
+                "segment_ingest_rate_per_s": round((size - segment_start) / segment_seconds, 1) if segment_seconds else None,
+                "cumulative_ingest_rate_per_s": round(size / ingest_seconds, 1) if ingest_seconds else None,
+                "matrix_bytes": stats["matrix_bytes"],
+                "nonzeros": stats["nonzeros"],
+                "bytes_per_resume": round(stats["matrix_bytes"] / size, 1),
+                "rss_bytes": sampler.current_rss(),
+                "query": latency_summary(latencies),
+            }
+            results.append(result)
+            print(f"{size:>9} resumes  ingest {result['segment_ingest_rate_per_s']:>9.1f}/s  "
+                  f"index {stats['matrix_bytes'] / 2**20:>8.1f} MiB  RSS {result['rss_bytes'] / 2**20:>8.1f} MiB  "
+                  f"top-{top_k} p50 {result['query']['p50_ms']:>8.2f} ms  p95 {result['query']['p95_ms']:>8.2f} ms")
+    return {
+        "environment": environment(),
+        "settings": {"seed": seed, "queries": queries, "top_k": top_k, "batch_size": batch_size,
+                     "max_features": max_features, "hashing": hashing, "fit_documents": FIT_RESUMES + FIT_JOBS,
+                     "fit_seconds": round(fit_seconds, 3), "model_version": model["version"]},
+        "peak_rss_bytes": sampler.peak_rss_bytes,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resume ingestion and ranking at scale")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=200, help="Job descriptions ranked at each size")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Resumes vectorized per call")
+    parser.add_argument("--max-features", type=int, default=20000)
+    parser.add_argument("--hashing", type=int, metavar="N_FEATURES",
+                        help="Use a feature-hashing model with this many columns")
+    parser.add_argument("--output", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    report = run(args.sizes, args.seed, args.queries, args.top_k, args.batch_size, max_features=args.max_features,
+                 hashing=args.hashing)
+    if args.output:
+        print(f"Report written to {write_report(report, args.output)}")
@@ -0,0 +1,177 @@
+"""
+Helpers shared by the benchmark scripts in this directory.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import threading
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+APP_DIR = os.path.join(REPO_DIR, 'backend', 'app')
+UTILS_DIR = os.path.join(REPO_DIR, 'backend', 'utils')
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Same import layout as backend/app/main.py
+for path in (REPO_DIR, APP_DIR, UTILS_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# Bundled sample documents
+TEXT_LAYER_PDFS = [
+    os.path.join(APP_DIR, 'resume-sample.pdf'),
+    os.path.join(UTILS_DIR, 'TABLE.pdf'),
+    os.path.join(UTILS_DIR, 'sample-tables.pdf'),
+    os.path.join(UTILS_DIR, 'Lorem_ipsum.pdf'),
+    os.path.join(UTILS_DIR, 'PDF_with_symbols.pdf'),
+]
+OCR_PDF = os.path.join(UTILS_DIR, 'Flattned_PDF_with_image.pdf')
+RESUME_PDF = os.path.join(APP_DIR, 'resume-sample.pdf')
+
+SAMPLE_JOB_DESCRIPTION = (
+    "We are hiring a Python developer with experience in machine learning, data analysis, "
+    "SQL databases and REST APIs. The role involves building data pipelines, deploying models "
+    "to production, writing unit tests and working with product managers and customer support. "
+    "Familiarity with scikit-learn, pandas, Docker and cloud platforms is a plus."
+)
+
+
+# Settings that turn off the server-side result caches, so benchmarks measure the
+# pipeline rather than cache hits
+CACHE_DISABLED_ENV = {
+    "PDF_CACHE_MAX_BYTES": "0",
+    "ANALYSIS_CACHE_MAX_ENTRIES": "0",
+}
+
+
+def disable_caches(env):
+    """
+    Turn off the PDF text and analysis caches in env (os.environ or a copy of it).
+    Must run before backend.app.main is imported, as both read their size at import time.
+    """
+    env.update(CACHE_DISABLED_ENV)
+    return env
+
+
+def percentile(values, fraction):
+    """
+    Linear-interpolated percentile of values, fraction in [0, 1].
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(latencies, elapsed=None):
+    """
+    Summarize per-operation latencies (seconds).
+
+    Returns:
+        dict: count, mean/p50/p95/p99/max in milliseconds and throughput (ops/s)
+    """
+    elapsed = elapsed if elapsed is not None else sum(latencies)
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "count": len(latencies),
+        "mean_ms": to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": to_ms(percentile(latencies, 0.50)),
+        "p95_ms": to_ms(percentile(latencies, 0.95)),
+        "p99_ms": to_ms(percentile(latencies, 0.99)),
+        "max_ms": to_ms(max(latencies)) if latencies else None,
+        "throughput_per_s": round(len(latencies) / elapsed, 2) if elapsed else None,
+    }
+
+
+class PeakRssSampler:
+    """
+    Tracks the peak resident set size of this process and its children (the
+    worker pool) while in use as a context manager.
+    """
+
+    def __init__(self, interval=0.01):
+        import psutil
+        self.interval = interval
+        self.process = psutil.Process()
+        self.start_rss_bytes = 0
+        self.peak_rss_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def current_rss(self):
+        rss = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except Exception:
+                pass
+        return rss
+
+    def __enter__(self):
+        self.start_rss_bytes = self.peak_rss_bytes = self.current_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss_bytes = max(self.peak_rss_bytes, self.current_rss())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss_bytes = max(self.peak_rss_bytes, self.current_rss())
+
+
+def environment():
+    """
+    Describe the machine a report was produced on; numbers only compare on similar machines.
+    """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return path
+
+
+def read_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results, baseline, metric="p50_ms", threshold=0.25):
+    """
+    Find cases whose metric got worse than the baseline by more than threshold.
+
+    Args:
+        results (dict): {case: summary} of the current run
+        baseline (dict): {case: summary} of the baseline run
+        metric (str): Summary field to compare (higher is worse)
+        threshold (float): Allowed relative slowdown, 0.25 = 25%
+
+    Returns:
+        list: [{"case", "baseline", "current", "change"}] for every regressed case
+    """
+    regressions = []
+    for case, summary in results.items():
+        before = baseline.get(case, {}).get(metric)
+        after = summary.get(metric)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        if change > threshold:
+            regressions.append({"case": case, "baseline": before, "current": after, "change": round(change, 3)})
+    return regressions
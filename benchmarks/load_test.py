@@ -0,0 +1,215 @@
+"""
+Load test of the FastAPI service at increasing concurrency levels.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 1 2 4 8 16 32] [--duration 20]
+                                   [--mix text_jd=1,pdf_jd=1,resume=1,match=2] [--output load.json]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000   # against an already running server
+
+Unless --url is given, a local uvicorn (backend.app.main:app) is started on a
+free port and waited for on /ready. PDFs come from the bundled samples and the
+PDF text and analysis caches of the local server are disabled (--with-cache keeps
+them), so every request pays for extraction and scoring. Each level reports throughput, latency percentiles
+and error rates. The saturation point is the first level where adding clients
+no longer raises throughput by --saturation-gain, or errors exceed --max-error-rate.
+"""
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+
+from common import (
+    REPO_DIR, TEXT_LAYER_PDFS, SAMPLE_JOB_DESCRIPTION, latency_summary, environment, write_report,
+    disable_caches,
+)
+
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32]
+DEFAULT_MIX = "text_jd=1,pdf_jd=1,resume=1,match=2"
+
+
+def load_samples():
+    samples = []
+    for path in TEXT_LAYER_PDFS:
+        with open(path, 'rb') as f:
+            samples.append((os.path.basename(path), f.read()))
+    return samples
+
+
+def build_request(kind, rng, samples):
+    """
+    Return (path, httpx request kwargs) for one request of the given kind.
+    """
+    name, pdf = rng.choice(samples)
+    pdf_file = {'file': (name, pdf, 'application/pdf')}
+    if kind == "text_jd":
+        return '/analyze-job-description/', {'data': {'job_description': SAMPLE_JOB_DESCRIPTION}}
+    if kind == "pdf_jd":
+        return '/analyze-job-description-pdf/', {'files': pdf_file}
+    if kind == "resume":
+        return '/analyze-resume/', {'files': pdf_file}
+    if kind == "match":
+        return '/match-resume-job/', {'files': pdf_file, 'data': {'job_description': SAMPLE_JOB_DESCRIPTION}}
+    raise ValueError(f"Unknown request kind {kind!r}")
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        weights[kind.strip()] = float(weight or 1)
+    return weights
+
+
+async def run_level(client, concurrency, duration, weights, samples, seed):
+    """
+    Keep concurrency clients sending requests for duration seconds.
+    """
+    kinds, kind_weights = list(weights), list(weights.values())
+    latencies, by_kind, statuses, errors = [], {}, {}, 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client_id):
+        nonlocal errors
+        rng = random.Random(f"{seed}-{concurrency}-{client_id}")
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights=kind_weights)[0]
+            path, kwargs = build_request(kind, rng, samples)
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, **kwargs)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if status == 200:
+                latencies.append(elapsed)
+                by_kind.setdefault(kind, []).append(elapsed)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    total = len(latencies) + errors
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": statuses,
+        "latency": latency_summary(latencies, elapsed),
+        "by_kind": {kind: latency_summary(values, elapsed) for kind, values in sorted(by_kind.items())},
+    }
+
+
+def find_saturation(levels, min_gain, max_error_rate):
+    """
+    Return the first concurrency level past which the service stops scaling, or None.
+    """
+    for previous, level in zip(levels, levels[1:]):
+        if level["error_rate"] > max_error_rate:
+            return level["concurrency"]
+        before = previous["latency"]["throughput_per_s"] or 0
+        after = level["latency"]["throughput_per_s"] or 0
+        if before and (after - before) / before < min_gain:
+            return previous["concurrency"]
+    return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, with_cache, timeout=120):
+    """
+    Start uvicorn on port and wait until /ready answers 200.
+    """
+    import httpx
+    env = dict(os.environ, LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"))
+    if not with_cache:
+        disable_caches(env)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=REPO_DIR, env=env,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+
+async def run(url, levels, duration, weights, seed, timeout):
+    import httpx
+    samples = load_samples()
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    results = []
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        for concurrency in levels:
+            result = await run_level(client, concurrency, duration, weights, samples, seed)
+            results.append(result)
+            latency = result["latency"]
+            print(f"concurrency {concurrency:>4}  {latency['throughput_per_s'] or 0:>8.2f} req/s  "
+                  f"p50 {latency['p50_ms'] or 0:>9.1f} ms  p95 {latency['p95_ms'] or 0:>9.1f} ms  "
+                  f"p99 {latency['p99_ms'] or 0:>9.1f} ms  errors {result['error_rate']:.1%}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the resume analyzer API")
+    parser.add_argument("--url", help="Base URL of a running server; by default a local uvicorn is started")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_LEVELS)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Request kinds and weights: text_jd, pdf_jd, resume, match")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the local server's PDF text and analysis caches")
+    parser.add_argument("--saturation-gain", type=float, default=0.1,
+                        help="Minimum relative throughput gain for a level to count as still scaling")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--output", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    for kind in weights:
+        build_request(kind, random.Random(0), [("x.pdf", b"")])
+    levels = sorted(set(args.concurrency))
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = start_server(port, args.with_cache)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        results = asyncio.run(run(url, levels, args.duration, weights, args.seed, args.timeout))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    saturation = find_saturation(results, args.saturation_gain, args.max_error_rate)
+    print(f"Saturation point: {f'concurrency {saturation}' if saturation else 'not reached'}")
+    report = {
+        "environment": environment(),
+        "settings": {"url": url, "duration": args.duration, "mix": weights, "seed": args.seed,
+                     "with_cache": args.with_cache, "local_server": server is not None},
+        "saturation_concurrency": saturation,
+        "levels": results,
+    }
+    if args.output:
+        print(f"Report written to {write_report(report, args.output)}")
@@ -0,0 +1,170 @@
+"""
+Deterministic generator of synthetic resumes and job descriptions.
+
+Usage:
+    python benchmarks/synthetic_corpus.py --resumes 1000 --jobs 100 --output corpus_dir [--seed 42]
+
+Documents are plain text built from role-specific skill sets. Skills and generic
+terms are drawn with Zipf-like weights, so a few terms are very common and most
+are rare, like in real resumes. The same seed always produces the same corpus.
+The output directory can be fed to backend/app/tfidf_model.py --corpus.
+"""
+import os
+import random
+import argparse
+
+# Role -> skills that mostly appear together
+ROLE_SKILLS = {
+    "Software Engineer": ["Python", "Java", "Go", "C++", "REST APIs", "microservices", "Docker", "Kubernetes",
+                          "PostgreSQL", "Redis", "Git", "CI/CD", "unit testing", "system design", "AWS", "Linux"],
+    "Data Scientist": ["Python", "R", "pandas", "NumPy", "scikit-learn", "machine learning", "statistics",
+                       "SQL", "TensorFlow", "PyTorch", "A/B testing", "data visualization", "Jupyter", "Spark"],
+    "Data Engineer": ["Python", "SQL", "Spark", "Airflow", "Kafka", "ETL", "data pipelines", "Snowflake",
+                      "BigQuery", "dbt", "AWS", "Scala", "Hadoop", "data modeling"],
+    "Frontend Developer": ["JavaScript", "TypeScript", "React", "Vue", "CSS", "HTML", "webpack", "Redux",
+                           "accessibility", "responsive design", "Jest", "GraphQL", "Figma"],
+    "DevOps Engineer": ["Kubernetes", "Docker", "Terraform", "Ansible", "AWS", "GCP", "Azure", "Linux",
+                        "monitoring", "Prometheus", "Grafana", "CI/CD", "Bash", "incident response"],
+    "Product Manager": ["roadmapping", "stakeholder management", "user research", "Agile", "Scrum", "Jira",
+                        "analytics", "SQL", "A/B testing", "product strategy", "customer interviews"],
+    "Customer Support Specialist": ["customer service", "Zendesk", "CRM", "communication", "troubleshooting",
+                                    "ticketing", "Salesforce", "conflict resolution", "documentation"],
+    "Accountant": ["bookkeeping", "Excel", "financial reporting", "GAAP", "tax preparation", "QuickBooks",
+                   "auditing", "reconciliation", "budgeting", "SAP", "payroll"],
+    "Marketing Manager": ["SEO", "content marketing", "Google Analytics", "social media", "campaign management",
+                          "copywriting", "email marketing", "HubSpot", "branding", "market research"],
+    "Nurse": ["patient care", "EMR", "medication administration", "triage", "BLS", "ACLS", "care planning",
+              "infection control", "patient education", "critical care"],
+}
+
+GENERAL_SKILLS = ["communication", "teamwork", "leadership", "problem solving", "time management",
+                  "mentoring", "presentation", "project management", "collaboration", "English", "Spanish",
+                  "French", "German", "negotiation", "attention to detail", "critical thinking"]
+
+ACTION_VERBS = ["Led", "Built", "Designed", "Improved", "Managed", "Developed", "Delivered", "Automated",
+                "Reduced", "Increased", "Launched", "Maintained", "Migrated", "Coordinated", "Analyzed",
+                "Implemented", "Optimized", "Supported", "Created", "Owned"]
+
+OBJECTS = ["reporting dashboards", "internal tools", "the onboarding process", "customer workflows",
+           "a data platform", "quarterly planning", "the release process", "cross-team projects",
+           "a new product line", "vendor relationships", "the support backlog", "cost controls",
+           "training programs", "service reliability", "the analytics stack", "a mobile app"]
+
+OUTCOMES = ["reducing costs by {n}%", "improving satisfaction by {n}%", "cutting latency by {n}%",
+            "serving {n}k users", "saving {n} hours per week", "growing revenue by {n}%",
+            "for a team of {n} people", "across {n} regions"]
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries", "Wayne Enterprises",
+             "Hooli", "Vandelay Industries", "Soylent", "Cyberdyne", "Wonka Foods", "Tyrell Systems"]
+
+DEGREES = ["B.Sc. Computer Science", "B.A. Economics", "M.Sc. Data Science", "B.Sc. Nursing",
+           "MBA", "B.Com Accounting", "B.A. Marketing", "M.Sc. Statistics", "B.Eng. Software Engineering"]
+
+# Zipf exponent of term popularity within each list
+ZIPF_EXPONENT = 1.1
+
+
+def _zipf_weights(count):
+    return [1 / (rank ** ZIPF_EXPONENT) for rank in range(1, count + 1)]
+
+
+def _pick(rng, items, k):
+    """
+    Draw k distinct items with Zipf-like weights (earlier items are more popular).
+    """
+    k = min(k, len(items))
+    weights = _zipf_weights(len(items))
+    chosen = []
+    pool = list(items)
+    while len(chosen) < k:
+        item = rng.choices(pool, weights=weights[:len(pool)])[0]
+        index = pool.index(item)
+        chosen.append(pool.pop(index))
+        del weights[index]
+    return chosen
+
+
+def _bullet(rng):
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 60))
+    return f"{rng.choice(ACTION_VERBS)} {rng.choice(OBJECTS)}, {outcome}."
+
+
+def generate_resume(rng):
+    """
+    Return one synthetic resume text; rng is a random.Random.
+    """
+    role = rng.choices(list(ROLE_SKILLS), weights=_zipf_weights(len(ROLE_SKILLS)))[0]
+    years = rng.randint(1, 20)
+    skills = _pick(rng, ROLE_SKILLS[role], rng.randint(5, 12)) + _pick(rng, GENERAL_SKILLS, rng.randint(2, 5))
+    lines = [
+        f"{role}",
+        f"Summary: {role} with {years} years of experience in {', '.join(skills[:3])}.",
+        f"Skills: {', '.join(skills)}",
+        "Experience",
+    ]
+    # Log-normal number of bullets: most resumes are short, a few are long
+    bullets = max(2, min(40, int(rng.lognormvariate(1.8, 0.5))))
+    for _ in range(rng.randint(1, 4)):
+        lines.append(f"{role} at {rng.choice(COMPANIES)}, {rng.randint(1995, 2024)}")
+        lines.extend(_bullet(rng) for _ in range(max(1, bullets // 2)))
+    lines.append(f"Education: {rng.choice(DEGREES)}")
+    return "\n".join(lines)
+
+
+def generate_job_description(rng):
+    """
+    Return one synthetic job description text; rng is a random.Random.
+    """
+    role = rng.choices(list(ROLE_SKILLS), weights=_zipf_weights(len(ROLE_SKILLS)))[0]
+    required = _pick(rng, ROLE_SKILLS[role], rng.randint(4, 8))
+    nice_to_have = _pick(rng, [s for s in ROLE_SKILLS[role] if s not in required], rng.randint(1, 3))
+    soft = _pick(rng, GENERAL_SKILLS, rng.randint(2, 4))
+    return "\n".join([
+        f"{rng.choice(COMPANIES)} is hiring a {role}.",
+        f"Requirements: {rng.randint(1, 10)}+ years of experience with {', '.join(required)}.",
+        f"Nice to have: {', '.join(nice_to_have)}.",
+        f"We value {', '.join(soft)}.",
+        f"You will work on {rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}.",
+    ])
+
+
+def iter_resumes(count, seed=42):
+    """
+    Yield count synthetic resumes; the sequence depends only on seed.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_resume(rng)
+
+
+def iter_job_descriptions(count, seed=42):
+    """
+    Yield count synthetic job descriptions; the sequence depends only on seed.
+    """
+    rng = random.Random(f"jobs-{seed}")
+    for _ in range(count):
+        yield generate_job_description(rng)
+
+
+def write_corpus(output_dir, resumes, jobs, seed=42):
+    """
+    Write resumes and job descriptions as .txt files under output_dir.
+    """
+    for kind, documents in (("resumes", iter_resumes(resumes, seed)), ("jobs", iter_job_descriptions(jobs, seed))):
+        directory = os.path.join(output_dir, kind)
+        os.makedirs(directory, exist_ok=True)
+        for i, text in enumerate(documents):
+            with open(os.path.join(directory, f"{kind[:-1]}-{i:07d}.txt"), "w", encoding="utf-8") as f:
+                f.write(text)
+    return output_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume/job description corpus")
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True, help="Directory to write resumes/ and jobs/ into")
+    args = parser.parse_args()
+    write_corpus(args.output, args.resumes, args.jobs, args.seed)
+    print(f"Wrote {args.resumes} resumes and {args.jobs} job descriptions to {args.output}")
@@ -652,16 +652,24 @@ def matching_page():
                 with st.spinner("🤖 AI is analyzing compatibility..."):
                     try:
                         files = {"file": (uploaded_file.name, uploaded_file.getvalue(), "application/pdf")}
+                        # Send the ETag of the last result so an unchanged match comes back as 304
+                        last_match = st.session_state.get("last_match")
+                        headers = {"If-None-Match": last_match["etag"]} if last_match else {}
                         
                         if jd_input_method == "📝 Text":
                             data = {"job_description": job_description}
-                            response = requests.post(f"{API_BASE_URL}/match-resume-job/", files=files, data=data)
+                            response = requests.post(f"{API_BASE_URL}/match-resume-job/", files=files, data=data, headers=headers)
                         else:
                             files["jd_file"] = (uploaded_jd_file.name, uploaded_jd_file.getvalue(), "application/pdf")
-                            response = requests.post(f"{API_BASE_URL}/match-resume-job-pdf/", files=files)
+                            response = requests.post(f"{API_BASE_URL}/match-resume-job-pdf/", files=files, headers=headers)
                         
-                        if response.status_code == 200:
-                            result = response.json()
+                        if response.status_code in (200, 304):
+                            if response.status_code == 304:
+                                result = last_match["result"]
+                            else:
+                                result = response.json()
+                                if response.headers.get("ETag"):
+                                    st.session_state.last_match = {"etag": response.headers["ETag"], "result": result}
                             analysis = result.get("analysis", {})
                             
                             st.success("✅ Compatibility analysis completed!")
@@ -0,0 +1,19 @@
+import os
+import sys
+import tempfile
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Same import layout as backend/app/main.py
+for path in (REPO_DIR, os.path.join(REPO_DIR, 'backend', 'app'), os.path.join(REPO_DIR, 'backend', 'utils')):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# Importing backend/app/main.py opens its databases and starts task workers: keep
+# them out of the source tree, leave task execution to the tests, and test without
+# a corpus-fitted model unless a test loads one
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="resume-analyzer-tests-")
+os.environ.setdefault("REGISTRY_DB_PATH", os.path.join(_TEST_DATA_DIR, "registry.sqlite3"))
+os.environ.setdefault("TASK_DB_PATH", os.path.join(_TEST_DATA_DIR, "tasks.sqlite3"))
+os.environ.setdefault("TFIDF_MODEL_PATH", os.path.join(_TEST_DATA_DIR, "no-model.joblib"))
+os.environ.setdefault("TASK_WORKERS", "0")
+os.environ.setdefault("POOL_WORKERS", "2")
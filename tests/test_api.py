@@ -0,0 +1,113 @@
+"""
+HTTP behaviour of the API: conditional requests and error status codes.
+"""
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from worker_pool import PoolBusyError, PoolBrokenError
+
+RESUME_PDF = os.path.join(main.APP_DIR, "resume-sample.pdf")
+JOB_DESCRIPTION = "Python developer with machine learning, SQL and cloud experience."
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+def match(client, job_description=JOB_DESCRIPTION, headers=None):
+    with open(RESUME_PDF, "rb") as f:
+        return client.post(
+            "/match-resume-job/",
+            files={"file": ("resume.pdf", f, "application/pdf")},
+            data={"job_description": job_description},
+            headers=headers or {},
+        )
+
+
+def test_match_with_current_etag_is_not_modified(client):
+    response = match(client)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    lookups = main.analysis_cache.stats()
+    for header in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        response = match(client, headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    # The analysis was not looked up, let alone run
+    assert main.analysis_cache.stats() == lookups
+
+
+def test_match_with_stale_etag_is_answered_in_full(client):
+    etag = match(client).headers["ETag"]
+    response = match(client, job_description=JOB_DESCRIPTION + " Docker.", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "analysis" in response.json()
+
+
+def test_ranking_without_a_fitted_model_is_unavailable(client):
+    response = client.post("/rank-resumes", data={"job_description": JOB_DESCRIPTION})
+    assert response.status_code == 503
+    assert "corpus-fitted" in response.json()["error"]
+
+
+def test_unknown_job_description_is_not_found(client):
+    assert client.get("/job-descriptions/unknown").status_code == 404
+    assert client.delete("/job-descriptions/unknown").status_code == 404
+    with open(RESUME_PDF, "rb") as f:
+        response = client.post(
+            "/match-resume-job/", files={"file": ("resume.pdf", f, "application/pdf")}, data={"job_id": "unknown"}
+        )
+    assert response.status_code == 404
+    assert "unknown" in response.json()["error"]
+
+
+def test_unknown_resume_is_not_found(client):
+    assert client.get("/resumes/unknown").status_code == 404
+    assert client.delete("/resumes/unknown").status_code == 404
+    response = client.post("/match-resume-job/", data={"resume_id": "unknown", "job_description": JOB_DESCRIPTION})
+    assert response.status_code == 404
+    response = client.post("/match-batch/", data={"resume_ids": ["unknown"], "job_description_texts": [JOB_DESCRIPTION]})
+    assert response.status_code == 404
+
+
+def test_unknown_pdf_backend_is_a_bad_request(client):
+    with open(RESUME_PDF, "rb") as f:
+        response = client.post(
+            "/analyze-resume/", files={"file": ("resume.pdf", f, "application/pdf")}, data={"pdf_backend": "bogus"}
+        )
+    assert response.status_code == 400
+    assert "bogus" in response.json()["error"]
+    response = client.post(
+        "/match-batch/",
+        data={"resume_ids": ["unknown"], "job_description_texts": [JOB_DESCRIPTION], "pdf_backend": "bogus"},
+    )
+    assert response.status_code == 400
+
+
+def test_oversized_batch_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_JOBS", 2)
+    response = client.post("/match-batch/", data={"resume_ids": ["unknown"], "job_description_texts": ["a", "b", "c"]})
+    assert response.status_code == 413
+    assert "at most" in response.json()["error"]
+    response = client.post("/match-batch/", data={"resume_ids": ["unknown"], "job_description_texts": ["a", "b"]})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("error", [PoolBusyError("Server busy"), PoolBrokenError("A worker process died; please retry")])
+def test_full_or_broken_pool_is_unavailable(client, monkeypatch, error):
+    async def run_in_pool(func, *args):
+        raise error
+
+    monkeypatch.setattr(main, "run_in_pool", run_in_pool)
+    response = client.post("/analyze-job-description/", data={"job_description": JOB_DESCRIPTION})
+    assert response.status_code == 503
+    assert response.json() == {"error": str(error)}
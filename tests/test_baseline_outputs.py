@@ -0,0 +1,43 @@
+"""
+Regression test: text normalization and the comprehensive analysis must keep
+producing exactly what the original implementation produced.
+
+data/baseline_outputs.json was recorded by running the original functions
+(pdf_parser.clean_extracted_text, tfidf_analyzer.preprocess_text and
+comprehensive_resume_job_analysis of the baseline commit) on hand-written edge
+cases, seeded random strings and synthetic resume/job description pairs. The
+analysis is checked without a corpus-fitted model, as the baseline fitted a
+vectorizer per request.
+"""
+import os
+import json
+
+import pytest
+
+from backend.utils.text_normalizer import clean_text, normalize_for_tfidf
+import tfidf_analyzer
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'baseline_outputs.json'), encoding='utf-8') as f:
+    BASELINE = json.load(f)
+
+
+@pytest.fixture
+def no_fitted_model(monkeypatch):
+    monkeypatch.setattr(tfidf_analyzer, "_tfidf_model", None)
+    monkeypatch.setattr(tfidf_analyzer, "_tfidf_model_checked", True)
+
+
+@pytest.mark.parametrize("text, expected", BASELINE["clean_text"])
+def test_clean_text_matches_baseline(text, expected):
+    assert clean_text(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", BASELINE["normalize_for_tfidf"])
+def test_normalize_for_tfidf_matches_baseline(text, expected):
+    assert normalize_for_tfidf(text) == expected
+
+
+@pytest.mark.parametrize("resume_text, job_description_text, expected", BASELINE["comprehensive_resume_job_analysis"])
+def test_comprehensive_analysis_matches_baseline(no_fitted_model, resume_text, job_description_text, expected):
+    result = tfidf_analyzer.comprehensive_resume_job_analysis(resume_text, job_description_text)
+    assert json.loads(json.dumps(result, default=float)) == expected
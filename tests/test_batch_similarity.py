@@ -0,0 +1,50 @@
+"""
+/match-batch/ must report the same common keywords as a single-pair analysis.
+"""
+import pytest
+
+import tfidf_analyzer
+from tfidf_model import fit_tfidf_model
+
+RESUMES = [
+    "Senior Python developer. Python, Django, Flask, REST APIs, PostgreSQL, Docker, AWS. "
+    "Built data pipelines in Python and Spark; mentored developers.",
+    "Data scientist: machine learning, Python, pandas, scikit-learn, SQL, statistics, "
+    "deep learning with TensorFlow. Communication and teamwork.",
+    "Frontend engineer with JavaScript, TypeScript, React, CSS and HTML. Node.js, REST APIs, Docker.",
+]
+JOB_DESCRIPTIONS = [
+    "We are hiring a Python developer with Django or Flask, REST APIs, PostgreSQL and Docker. AWS is a plus.",
+    "Machine learning engineer: Python, scikit-learn, TensorFlow, SQL, statistics and strong communication.",
+]
+
+
+def single_pair_keywords(resume_text, job_description_text, top_terms):
+    analysis = tfidf_analyzer.comprehensive_resume_job_analysis(resume_text, job_description_text)
+    return [entry["term"] for entry in analysis["similarity_analysis"]["common_keywords"][:top_terms]]
+
+
+@pytest.fixture(params=["per-request", "fitted"])
+def model(request, monkeypatch):
+    model = None
+    if request.param == "fitted":
+        model = fit_tfidf_model(RESUMES + JOB_DESCRIPTIONS)
+        model["feature_names"] = model["vectorizer"].get_feature_names_out()
+    monkeypatch.setattr(tfidf_analyzer, "_tfidf_model", model)
+    monkeypatch.setattr(tfidf_analyzer, "_tfidf_model_checked", True)
+    return model
+
+
+@pytest.mark.parametrize("top_terms", [1, 3, 5])
+def test_batch_keywords_match_single_pair_analysis(model, top_terms):
+    if model is None:
+        # Without a fitted model a batch is vectorized as a whole, so only a
+        # one-by-one batch sees the same IDF weights as the pair on its own
+        pairs = [(i, j) for i in range(len(RESUMES)) for j in range(len(JOB_DESCRIPTIONS))]
+        batches = [([RESUMES[i]], [JOB_DESCRIPTIONS[j]], [(i, j, 0, 0)]) for i, j in pairs]
+    else:
+        batches = [(RESUMES, JOB_DESCRIPTIONS, [(i, j, i, j) for i in range(len(RESUMES)) for j in range(len(JOB_DESCRIPTIONS))])]
+    for resumes, job_descriptions, pairs in batches:
+        result = tfidf_analyzer.batch_resume_job_similarity(resumes, job_descriptions, top_terms=top_terms)
+        for i, j, batch_i, batch_j in pairs:
+            assert result["common_keywords"][batch_i][batch_j] == single_pair_keywords(RESUMES[i], JOB_DESCRIPTIONS[j], top_terms)
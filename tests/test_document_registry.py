@@ -0,0 +1,67 @@
+"""
+DocumentRegistry: memory LRU bounded by size, backed by SQLite.
+"""
+import pickle
+
+import pytest
+
+from document_registry import DocumentRegistry, UnknownDocumentError, document_id
+
+RECORD_SIZE = len(pickle.dumps({"text": "x" * 100}, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def record(n):
+    return {"text": str(n) * 100}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "registry.sqlite3")
+
+
+def test_document_id_depends_on_the_text_only():
+    assert document_id("python developer") == document_id("python developer")
+    assert document_id("python developer") != document_id("java developer")
+
+
+def test_least_recently_used_records_are_evicted_from_memory(db_path):
+    registry = DocumentRegistry("job", db_path, max_bytes=2 * RECORD_SIZE)
+    for n in range(3):
+        registry.put(f"doc{n}", record(n))
+    stats = registry.stats()
+    assert (stats["entries"], stats["size_bytes"], stats["documents"]) == (2, 2 * RECORD_SIZE, 3)
+
+    # doc0 was evicted from memory but is still on disk
+    assert registry.get("doc0") == record(0)
+    assert registry.disk_hits == 1
+    # Reading doc0 back made doc1 the least recently used entry
+    assert registry.get("doc2") == record(2)
+    assert registry.get("doc1") == record(1)
+    assert (registry.memory_hits, registry.disk_hits) == (1, 2)
+
+
+def test_records_larger_than_the_budget_are_only_stored_on_disk(db_path):
+    registry = DocumentRegistry("job", db_path, max_bytes=RECORD_SIZE - 1)
+    registry.put("doc", record(1))
+    assert registry.stats()["entries"] == 0
+    assert registry.get("doc") == record(1)
+
+
+def test_records_survive_a_restart_and_kinds_are_separate(db_path):
+    DocumentRegistry("job", db_path).put("doc", record(1))
+    assert DocumentRegistry("job", db_path).get("doc") == record(1)
+    with pytest.raises(UnknownDocumentError):
+        DocumentRegistry("resume", db_path).get("doc")
+
+
+def test_delete_removes_both_tiers(db_path):
+    registry = DocumentRegistry("job", db_path)
+    registry.put("doc", record(1))
+    registry.delete("doc")
+    with pytest.raises(UnknownDocumentError):
+        registry.get("doc")
+    with pytest.raises(UnknownDocumentError):
+        DocumentRegistry("job", db_path).get("doc")
+    with pytest.raises(UnknownDocumentError):
+        registry.delete("doc")
+    assert registry.stats()["misses"] == 1
@@ -0,0 +1,80 @@
+"""
+PDF extraction: the text cache and how pages are joined.
+"""
+import os
+
+from backend.utils.pdf_parser import PdfTextCache, extract_document, extract_document_cached, iter_document_pages
+
+UTILS_DIR = os.path.join(os.path.dirname(__file__), '..', 'backend', 'utils')
+
+
+def document(text):
+    return {"text": text, "ocr_pages": [], "page_count": 1, "truncated": None}
+
+
+def read_pdf(name):
+    with open(os.path.join(UTILS_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def test_cache_key_depends_on_content_and_backend():
+    key = PdfTextCache.make_key(b"%PDF-1 a")
+    assert key == PdfTextCache.make_key(b"%PDF-1 a")
+    assert key != PdfTextCache.make_key(b"%PDF-1 b")
+    assert PdfTextCache.make_key(b"%PDF-1 a", "pdfplumber") != PdfTextCache.make_key(b"%PDF-1 a", "pypdfium2")
+
+
+def test_memory_tier_evicts_least_recently_used_text():
+    cache = PdfTextCache(max_bytes=10)
+    cache.put("a", document("aaaa"))
+    cache.put("b", document("bbbb"))
+    assert cache.get("a") == document("aaaa")
+    cache.put("c", document("cccc"))
+    assert cache.get("b") is None
+    assert cache.get("a") == document("aaaa")
+    assert cache.get("c") == document("cccc")
+    stats = cache.stats()
+    assert (stats["entries"], stats["size_bytes"], stats["memory_hits"], stats["misses"]) == (2, 8, 3, 1)
+
+
+def test_text_larger_than_the_budget_is_not_kept_in_memory():
+    cache = PdfTextCache(max_bytes=3)
+    cache.put("a", document("aaaa"))
+    assert cache.get("a") is None
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    PdfTextCache(max_bytes=0, disk_dir=str(tmp_path)).put("abcdef", document("text"))
+    cache = PdfTextCache(disk_dir=str(tmp_path))
+    assert cache.get("abcdef") == document("text")
+    # Loaded into memory on the first read
+    assert cache.get("abcdef") == document("text")
+    assert (cache.disk_hits, cache.memory_hits) == (1, 1)
+
+
+def test_unreadable_disk_entry_is_a_miss(tmp_path):
+    cache = PdfTextCache(disk_dir=str(tmp_path))
+    os.makedirs(tmp_path / "ab")
+    (tmp_path / "ab" / "abcdef.json").write_text("{not json", encoding='utf-8')
+    assert cache.get("abcdef") is None
+    assert cache.misses == 1
+
+
+def test_extract_document_cached_extracts_once():
+    cache = PdfTextCache()
+    pdf_bytes = read_pdf("Lorem_ipsum.pdf")
+    first = extract_document_cached(pdf_bytes, cache=cache)
+    assert first["text"]
+    assert extract_document_cached(pdf_bytes, cache=cache) is first
+    assert (cache.misses, cache.memory_hits) == (1, 1)
+
+
+def test_pages_are_joined_with_a_space():
+    pdf_bytes = read_pdf("sample-tables.pdf")
+    pages = [page["text"] for page in iter_document_pages(pdf_bytes, max_pages=0, max_chars=0, time_budget=0) if page.get("text")]
+    assert len(pages) > 1
+    result = extract_document(pdf_bytes, max_pages=0, max_chars=0, time_budget=0)
+    assert result["pages_read"] == result["page_count"] > 1
+    assert result["text"] == " ".join(pages)
+    assert result["text"].startswith(f"{pages[0]} {pages[1]}")
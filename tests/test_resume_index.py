@@ -0,0 +1,79 @@
+"""
+ResumeIndex: adding, replacing and removing resume vectors and ranking them.
+"""
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import tfidf_analyzer
+from resume_index import ResumeIndex, ModelNotLoadedError, vectorize_documents
+
+
+def vector(*values):
+    row = np.array(values, dtype=float)
+    return sp.csr_matrix(row / np.linalg.norm(row))
+
+
+JOB = vector(1, 1, 0, 0)
+
+
+def ranked_ids(index, top_k=10):
+    return [entry["resume_id"] for entry in index.rank(JOB, top_k)]
+
+
+def test_rank_orders_resumes_by_cosine_similarity():
+    index = ResumeIndex()
+    index.add("unrelated", vector(0, 0, 1, 1))
+    index.add("exact", vector(1, 1, 0, 0))
+    index.add("partial", vector(1, 0, 1, 0))
+    ranking = index.rank(JOB, top_k=2)
+    assert [entry["resume_id"] for entry in ranking] == ["exact", "partial"]
+    assert [entry["similarity_score"] for entry in ranking] == [1.0, 0.5]
+    assert ranking[0]["match_quality"] == tfidf_analyzer.match_quality_label(1.0)
+    assert ranked_ids(index) == ["exact", "partial", "unrelated"]
+
+
+def test_ties_keep_insertion_order():
+    index = ResumeIndex()
+    for resume_id in ("b", "a", "c"):
+        index.add(resume_id, vector(1, 0, 0, 0))
+    assert ranked_ids(index, top_k=2) == ["b", "a"]
+
+
+def test_adding_an_indexed_resume_replaces_its_vector():
+    index = ResumeIndex()
+    index.add("first", vector(1, 1, 0, 0))
+    index.add("second", vector(1, 0, 0, 0))
+    assert ranked_ids(index) == ["first", "second"]
+    index.add("first", vector(0, 0, 0, 1))
+    assert len(index) == 2
+    assert ranked_ids(index) == ["second", "first"]
+
+
+def test_remove_drops_pending_and_stored_rows():
+    index = ResumeIndex()
+    index.add("a", vector(1, 1, 0, 0))
+    index.add("b", vector(1, 0, 0, 0))
+    assert index.rank(JOB)  # stacks a and b into the matrix
+    index.add("c", vector(0, 1, 0, 0))
+    assert index.remove("a") and index.remove("c")
+    assert not index.remove("a")
+    assert "a" not in index and "b" in index
+    assert ranked_ids(index) == ["b"]
+    assert index.stats()["resumes"] == 1
+    index.remove("b")
+    assert index.rank(JOB) == []
+
+
+def test_rank_of_an_empty_index_or_zero_top_k_is_empty():
+    index = ResumeIndex()
+    assert index.rank(JOB) == []
+    index.add("a", vector(1, 0, 0, 0))
+    assert index.rank(JOB, top_k=0) == []
+
+
+def test_vectorize_documents_needs_a_fitted_model(monkeypatch):
+    monkeypatch.setattr(tfidf_analyzer, "_tfidf_model", None)
+    monkeypatch.setattr(tfidf_analyzer, "_tfidf_model_checked", True)
+    with pytest.raises(ModelNotLoadedError):
+        vectorize_documents(["python developer"])
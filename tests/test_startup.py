@@ -0,0 +1,25 @@
+"""
+Warm-up runs in the background: the server is live at once and ready afterwards.
+"""
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend.app import main
+
+
+def test_live_answers_while_warming_up_and_ready_follows(monkeypatch):
+    release = threading.Event()
+    preload = main.preload
+    monkeypatch.setattr(main, "preload", lambda: (release.wait(10), preload()))
+    monkeypatch.setitem(main.warm_up_state, "ready", False)
+    with TestClient(main.app) as client:
+        assert client.get("/live").status_code == 200
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+        release.set()
+        # A pool-backed request waits for the pool instead of failing
+        response = client.post("/analyze-job-description/", data={"job_description": "python developer"})
+        assert response.status_code == 200
+        assert client.get("/ready").json()["status"] == "ready"
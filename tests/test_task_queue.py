@@ -0,0 +1,89 @@
+"""
+TaskStore leases: claiming, renewing, recovering abandoned tasks and ignoring
+results from workers that lost their lease.
+"""
+import time
+
+import pytest
+
+import task_queue
+from task_queue import TaskStore, QUEUED, RUNNING, DONE, FAILED
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setitem(task_queue.TASK_HANDLERS, "echo", lambda params, files, report_progress: {"params": params})
+    return TaskStore(str(tmp_path / "tasks.sqlite3"))
+
+
+def expire_lease(store, task_id):
+    with store._connect() as conn:
+        conn.execute("UPDATE tasks SET heartbeat_at = ? WHERE id = ?", (time.time() - 3600, task_id))
+
+
+def test_claim_leases_the_oldest_task_with_its_files(store):
+    first = store.submit("echo", {"n": 1}, {"file": b"one"})
+    store.submit("echo", {"n": 2})
+    task = store.claim()
+    assert (task["id"], task["params"], task["files"]) == (first, {"n": 1}, {"file": b"one"})
+    assert task["lease"]
+    assert store.get(first)["status"] == RUNNING
+    assert store.claim()["lease"] != task["lease"]
+    assert store.claim() is None
+
+
+def test_heartbeat_keeps_a_running_task_from_being_recovered(store):
+    task_id = store.submit("echo", {})
+    task = store.claim()
+    expire_lease(store, task_id)
+    assert store.heartbeat(task_id, task["lease"])
+    assert store.recover(lease_seconds=60) == 0
+    assert store.get(task_id)["status"] == RUNNING
+
+
+def test_recover_requeues_a_task_whose_lease_expired(store):
+    task_id = store.submit("echo", {}, {"file": b"data"})
+    store.claim()
+    expire_lease(store, task_id)
+    assert store.recover(lease_seconds=60) == 1
+    task = store.get(task_id)
+    assert (task["status"], task["message"]) == (QUEUED, "requeued")
+    # The input files are kept for the next attempt
+    assert store.claim()["files"] == {"file": b"data"}
+
+
+def test_stale_finish_is_ignored(store):
+    task_id = store.submit("echo", {}, {"file": b"data"})
+    stale = store.claim()
+    expire_lease(store, task_id)
+    store.recover(lease_seconds=60)
+    current = store.claim()
+
+    assert not store.heartbeat(task_id, stale["lease"])
+    assert not store.set_progress(task_id, stale["lease"], 0.5, "stale")
+    assert not store.finish(task_id, stale["lease"], error="worker lost")
+    task = store.get(task_id)
+    assert (task["status"], task["error"]) == (RUNNING, None)
+
+    assert store.finish(task_id, current["lease"], result={"ok": True})
+    assert store.get(task_id, with_result=True)["result"] == {"ok": True}
+    # Finishing twice does not overwrite the stored result
+    assert not store.finish(task_id, current["lease"], error="again")
+    assert store.get(task_id)["status"] == DONE
+
+
+def test_run_next_task_stores_results_and_errors(store, monkeypatch):
+    done_id = store.submit("echo", {"n": 1})
+    assert task_queue.run_next_task(store)
+    assert store.get(done_id, with_result=True)["result"] == {"params": {"n": 1}}
+
+    def fail(params, files, report_progress):
+        report_progress(0.5, "halfway")
+        raise ValueError("bad input")
+
+    monkeypatch.setitem(task_queue.TASK_HANDLERS, "echo", fail)
+    failed_id = store.submit("echo", {})
+    assert task_queue.run_next_task(store)
+    task = store.get(failed_id)
+    assert (task["status"], task["error"]) == (FAILED, "ValueError: bad input")
+    assert not task_queue.run_next_task(store)
@@ -0,0 +1,56 @@
+"""
+The process pool must recover when one of its workers dies.
+"""
+import os
+import time
+import signal
+import asyncio
+
+import pytest
+
+import worker_pool
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    monkeypatch.setattr(worker_pool, "POOL_WORKERS", 2)
+    worker_pool.shutdown_pool()
+    yield
+    worker_pool.shutdown_pool()
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_pool_is_rebuilt_after_an_idle_worker_is_killed(small_pool):
+    async def scenario():
+        await worker_pool.warm_up_pool()
+        pid = await worker_pool.run_in_pool(os.getpid)
+        os.kill(pid, signal.SIGKILL)
+        wait_until(worker_pool.pool_broken)
+        assert worker_pool.pool_stats()["pool_ready"] == 0
+        # The next task gets a fresh pool
+        assert await worker_pool.run_in_pool(os.getpid) != pid
+        assert worker_pool.pool_stats()["pool_ready"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_task_lost_with_its_worker_fails_with_pool_broken_error(small_pool):
+    async def scenario():
+        pids = set()
+        while len(pids) < worker_pool.POOL_WORKERS:
+            pids.add(await worker_pool.run_in_pool(os.getpid))
+        pending = asyncio.ensure_future(worker_pool.run_in_pool(time.sleep, 5))
+        await asyncio.sleep(0.5)
+        for pid in pids:
+            os.kill(pid, signal.SIGKILL)
+        with pytest.raises(worker_pool.PoolBrokenError):
+            await pending
+        assert await worker_pool.run_in_pool(os.getpid) not in pids
+
+    asyncio.run(scenario())